@@ -1,12 +1,13 @@
 import sys
 import os
 import html as html_lib
+import urllib.parse
 
 sys.path.insert(0, os.path.dirname(__file__))
 
 import streamlit as st
 
-from db import init_db
+from db import init_db, get_article_by_id, get_article_references, get_referencing_articles
 from search import highlight_full_text, category_badge
 
 st.set_page_config(
@@ -297,7 +298,11 @@ st.markdown(f"""
 
 # ── 보조 패널 렌더링 함수 ─────────────────────────────────────────────────────
 def _render_side_panel():
-    article = st.session_state.get("side_panel")
+    # 세션에는 검색 결과 경량 행만 있으므로 본문은 여기서 id 로 조회
+    selected = st.session_state.get("side_panel")
+    article  = get_article_by_id(selected["id"]) if selected else None
+    if selected and article is None:
+        st.session_state.pop("side_panel", None)   # 그 사이 문서가 삭제된 경우
     keyword = st.session_state.get("_last_keyword", "")
 
     if article:
@@ -342,19 +347,29 @@ def _render_side_panel():
 
     art_num   = article.get("article_number") or ""
     art_title = article.get("article_title") or ""
-    art_text  = article.get("article_text", "")
+    art_text  = article.get("normalized_text", "")
     enacted   = article.get("enacted_date") or ""
     title_str = f" ({art_title})" if art_title else ""
+    mode      = st.session_state.get("_search_mode", "exact")
+    # 조문 뷰어(새 탭)에도 같은 검색어·검색 모드로 하이라이트되도록 함께 전달
+    viewer_url = "/?" + urllib.parse.urlencode({
+        "page": "viewer", "doc": article["doc_id"], "art": article["id"], "kw": keyword, "mode": mode,
+    })
+    meta_parts = [f'시행 {html_lib.escape(enacted)}'] if enacted else []
+    meta_parts.append(
+        f'<a href="{html_lib.escape(viewer_url)}" target="_blank" '
+        f'style="color:#16a34a;text-decoration:none;">문서에서 보기 ↗</a>'
+    )
 
     st.markdown(
         f'<div style="font-size:1rem;font-weight:700;color:#0f172a;margin-bottom:4px;">'
         f'{html_lib.escape(art_num)}{html_lib.escape(title_str)}</div>'
-        + (f'<div style="font-size:0.73rem;color:#94a3b8;margin-bottom:12px;">'
-           f'시행 {html_lib.escape(enacted)}</div>' if enacted else ''),
+        f'<div style="font-size:0.73rem;color:#94a3b8;margin-bottom:12px;">'
+        f'{" · ".join(meta_parts)}</div>',
         unsafe_allow_html=True,
     )
 
-    full_html = highlight_full_text(art_text, keyword)
+    full_html = highlight_full_text(art_text, keyword, mode)
     st.markdown(
         f'<div class="side-scroll" style="'
         f'background:#f8fafc;border-radius:8px;border:1px solid #e2e8f0;'
@@ -364,6 +379,47 @@ def _render_side_panel():
         unsafe_allow_html=True,
     )
 
+    # ── 참조 관계 (수집 시 추출한 article_refs 색인 조회) ───────────────────
+    if article.get("id") is not None:
+        _render_reference_list("인용 조문", [
+            (r["target_doc_name"], f"{_ref_label(r['target_key'])}{r['target_unit']}", r)
+            for r in get_article_references(article["id"])
+        ], article["doc_name"])
+        _render_reference_list("이 조문을 인용하는 조문", [
+            (r["doc_name"], r["article_number"] or "", r)
+            for r in get_referencing_articles(article["id"])
+        ], article["doc_name"])
+
+
+def _ref_label(key: str) -> str:
+    """조문 키 → 표기 ("9-2" → "제9조의2")."""
+    no, _, branch = key.partition("-")
+    return f"제{no}조" + (f"의{branch}" if branch else "")
+
+
+def _render_reference_list(title: str, items: list[tuple[str, str, dict]], current_doc: str):
+    """참조 목록: DB에 있는 조문은 조문 뷰어 링크(새 탭), 없는 조문은 표기만."""
+    if not items:
+        return
+    lines = []
+    for doc_name, label, row in items:
+        text = html_lib.escape(label if doc_name == current_doc else f"{doc_name} {label}")
+        if row.get("article_title"):
+            text += f' <span style="color:#94a3b8;">({html_lib.escape(row["article_title"])})</span>'
+        if row.get("id") is not None:
+            lines.append(
+                f'<a href="/?page=viewer&doc={row["doc_id"]}&art={row["id"]}" target="_blank" '
+                f'style="color:#16a34a;text-decoration:none;">{text}</a>'
+            )
+        else:
+            lines.append(f'<span style="color:#94a3b8;">{text}</span>')
+    st.markdown(
+        f'<div style="margin-top:14px;font-size:0.75rem;font-weight:600;color:#64748b;">'
+        f'{html_lib.escape(title)} <span style="color:#94a3b8;">{len(items)}</span></div>'
+        f'<div style="font-size:0.8rem;line-height:1.9;">{"<br>".join(lines)}</div>',
+        unsafe_allow_html=True,
+    )
+
 
 # ── 메인 콘텐츠 영역 ─────────────────────────────────────────────────────────
 col_main, col_side = st.columns([2.2, 1.1])
@@ -372,6 +428,19 @@ with col_main:
     if page == "search":
         from views import search_page
         search_page.render()
+    elif page == "viewer":
+        from views import doc_viewer
+        try:
+            _unit = st.query_params.get("unit")
+            doc_viewer.render(
+                int(st.query_params.get("doc", 0)),
+                int(st.query_params.get("art", 0)),
+                st.query_params.get("kw", ""),
+                int(_unit) if _unit is not None else None,
+                st.query_params.get("mode", "exact"),
+            )
+        except ValueError:
+            st.error("잘못된 조문 링크입니다.")
     else:
         from views import docs
         docs.render()
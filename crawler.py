@@ -8,16 +8,25 @@
 환경변수 LAW_API_KEY (.env)에 법제처 API 키를 설정해야 합니다.
 키 발급: https://open.law.go.kr/LSO/main.do → 오픈API 신청
 """
+import hashlib
+import itertools
 import os
 import re
+import tempfile
+import threading
+import time
 import xml.etree.ElementTree as ET
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import IO, Callable, Iterator, Optional
+from urllib.parse import urlsplit
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-_PARAGRAPH_START = re.compile(r"^[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮]|^\d+\.\s|^[가나다라마바사아자차카타파하]\.\s")
+_PARAGRAPH_START = re.compile(r"^[①-⑳]|^\d+(?:의\d+)?\.\s|^[가나다라마바사아자차카타파하]\.\s")
 
 
 def _normalize_law_text(text: str) -> str:
@@ -43,10 +52,25 @@ def _normalize_law_text(text: str) -> str:
     result = re.sub(r"[ \t]{2,}", " ", result)
     return result
 
-from db import upsert_document, insert_articles, update_article_count
+from db import ingest_document, get_document_source_state
+from structure import parse_heading
 
 load_dotenv()
 API_KEY = os.getenv("LAW_API_KEY", "")
+# 오픈API 기본 주소 (테스트 시 로컬 스탠드인 서버로 교체 가능)
+API_BASE_URL = os.getenv("LAW_API_BASE_URL", "https://open.law.go.kr/LSO/openApi").rstrip("/")
+
+# ── 수신 동시성 / 재시도 설정 ─────────────────────────────────────────────
+CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", "4"))
+# 동일 호스트 요청 간 최소 간격 (초)
+CRAWL_MIN_INTERVAL = float(os.getenv("CRAWL_MIN_INTERVAL", "0.5"))
+CRAWL_TIMEOUT = 30
+CRAWL_RETRIES = 3
+# 응답 본문 임시 보관: 이 크기까지는 메모리, 초과분은 임시 파일로
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+# iter_law_articles 출력 규칙 버전 — 조문·제목 분리 등 출력이 바뀌면 올릴 것.
+# 저장되는 source_hash 앞에 붙으므로, 이전 버전으로 수집한 법령은 본문이 같아도 다음 수집 때 다시 반영된다.
+CRAWLER_PARSE_VERSION = "3"
 
 # ── 크롤링 대상 법령 목록 (확장 가능) ─────────────────────────────────────
 MANAGED_LAWS = [
@@ -75,18 +99,62 @@ MANAGED_LAWS = [
 
 def _get_endpoint(law_type: str) -> str:
     if law_type == "admrul":
-        return "https://open.law.go.kr/LSO/openApi/getMOLSAdmRul.do"
-    return "https://open.law.go.kr/LSO/openApi/getMOLSLaw.do"
+        return f"{API_BASE_URL}/getMOLSAdmRul.do"
+    return f"{API_BASE_URL}/getMOLSLaw.do"
 
 
-def fetch_law_articles(
-    law_name: str, law_type: str = "law"
-) -> tuple[list[dict], Optional[str]]:
+# ── HTTP 세션 (keep-alive) + 호스트별 요청 간격 제한 ──────────────────────
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_host_next_time: dict[str, float] = {}
+_host_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    프로세스 공용 HTTP 세션. 연결 재사용(TCP/TLS 핸드셰이크 1회)과
+    일시 오류(429/5xx, 연결 실패)에 대한 지수 백오프 재시도를 적용.
     """
-    법제처 API로 조문 목록과 시행일을 수신.
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=CRAWL_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=CRAWL_MAX_WORKERS,
+                pool_maxsize=CRAWL_MAX_WORKERS,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
 
-    Returns: (articles, effective_date)
-    Raises: ValueError (API 키 없음) | requests.RequestException | ET.ParseError
+
+def _wait_for_host(url: str):
+    """동일 호스트에 CRAWL_MIN_INTERVAL 초 이상 간격으로 요청하도록 대기."""
+    host = urlsplit(url).netloc
+    with _host_lock:
+        now = time.monotonic()
+        start = max(now, _host_next_time.get(host, 0.0))
+        _host_next_time[host] = start + CRAWL_MIN_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+
+def _request_law(
+    law_name: str, law_type: str, etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> requests.Response:
+    """
+    법제처 API 요청. etag/last_modified 가 있으면 조건부 요청(If-None-Match /
+    If-Modified-Since)으로 보내며, 서버가 304 를 돌려주면 그대로 반환.
     """
     if not API_KEY:
         raise ValueError(
@@ -101,67 +169,243 @@ def fetch_law_articles(
         "type":   "XML",
         "query":  law_name,
     }
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
 
-    resp = requests.get(endpoint, params=params, timeout=30)
-    resp.raise_for_status()
+    _wait_for_host(endpoint)
+    resp = get_session().get(
+        endpoint, params=params, headers=headers, timeout=CRAWL_TIMEOUT, stream=True
+    )
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return resp
 
-    root = ET.fromstring(resp.content)
 
-    # 시행일 추출 (다양한 태그명 대응)
-    effective_date = (
-        root.findtext(".//시행일")
-        or root.findtext(".//공포일")
-        or root.findtext(".//법령정보/시행일")
-    )
+def _spool_response(resp: requests.Response) -> tuple[IO[bytes], str]:
+    """
+    응답 본문을 청크 단위로 임시 파일에 기록하면서 SHA-256 계산.
+    전체 본문을 bytes 로 올리지 않으므로 법령 크기와 무관하게 메모리 사용량이 일정.
+    Returns: (처음 위치로 되감은 파일 객체, "{CRAWLER_PARSE_VERSION}:{본문 해시}")
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    digest = hashlib.sha256()
+    try:
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            digest.update(chunk)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    finally:
+        resp.close()
+    spool.seek(0)
+    return spool, f"{CRAWLER_PARSE_VERSION}:{digest.hexdigest()}"
+
+
+def _find_effective_date(xml_file: IO[bytes]) -> Optional[str]:
+    """
+    시행일 태그가 나올 때까지만 스트리밍 파싱 (보통 기본정보 헤더에서 즉시 종료).
+    시행일이 없으면 공포일로 대체.
+    """
+    promulgated = None
+    for _, elem in ET.iterparse(xml_file):
+        if elem.tag == "시행일" and elem.text:
+            return elem.text
+        if elem.tag == "공포일" and elem.text and promulgated is None:
+            promulgated = elem.text
+        elif elem.tag == "조문":
+            elem.clear()
+    return promulgated
+
 
-    # 조문 파싱
-    articles = []
-    for article in root.iter("조문"):
-        text = article.findtext("조문내용") or ""
-        if not text.strip():
+def iter_law_articles(xml_file: IO[bytes]) -> Iterator[dict]:
+    """
+    API 응답 XML 을 iterparse 로 스트리밍하며 조문 dict 를 하나씩 생성.
+    처리한 <조문> 요소는 즉시 비워 트리가 문서 크기만큼 커지지 않도록 한다.
+    조문여부가 "전문"인 편/장/절/관 제목은 다음 조문의 "headings" 로 전달.
+    제목으로 해석되지 않는 "전문" 행은 종전처럼 조문 행으로 저장 (내용 유실 방지).
+    """
+    pending_headings: list[str] = []
+    for _, elem in ET.iterparse(xml_file):
+        if elem.tag != "조문":
             continue
-        articles.append({
-            "article_number": article.findtext("조문번호") or "",
-            "article_title":  article.findtext("조문제목") or "",
-            "article_text":   _normalize_law_text(text),
-            "page_number":    None,
-        })
+        text = elem.findtext("조문내용") or ""
+        heading = parse_heading(text) if elem.findtext("조문여부") == "전문" else None
+        if heading:
+            pending_headings.append(heading[1])
+        elif text.strip():
+            yield {
+                "article_number": elem.findtext("조문번호") or "",
+                "article_title":  elem.findtext("조문제목") or "",
+                "article_text":   _normalize_law_text(text),
+                "page_number":    None,
+                "headings":       pending_headings,
+            }
+            pending_headings = []
+        elem.clear()
+
+
+def _iter_spooled_articles(spool: IO[bytes]) -> Iterator[dict]:
+    """임시 파일의 조문을 스트리밍하고, 소비가 끝나면 파일을 닫음."""
+    try:
+        spool.seek(0)
+        yield from iter_law_articles(spool)
+    finally:
+        spool.close()
+
+
+def fetch_law_articles(
+    law_name: str, law_type: str = "law"
+) -> tuple[list[dict], Optional[str]]:
+    """
+    법제처 API로 조문 목록과 시행일을 수신 (공용 세션 사용, 스레드 안전).
 
+    Returns: (articles, effective_date)
+    Raises: ValueError (API 키 없음) | requests.RequestException | ET.ParseError
+    """
+    spool, _ = _spool_response(_request_law(law_name, law_type))
+    with spool:
+        effective_date = _find_effective_date(spool)
+        spool.seek(0)
+        articles = list(iter_law_articles(spool))
     return articles, effective_date
 
 
+def fetch_law_update(law_info: dict) -> dict:
+    """
+    저장된 상태와 비교하여 변경된 경우에만 조문 스트림을 준비.
+    - 304 Not Modified (ETag / Last-Modified) → 변경 없음
+    - 응답 본문 SHA-256 이 저장된 source_hash 와 같음 → 변경 없음 (파싱 생략)
+      시행일도 응답 본문에 포함되므로 해시 비교로 함께 확인된다.
+    - 저장된 source_hash 가 이전 CRAWLER_PARSE_VERSION 이면 조건부 요청 없이 받아 다시 반영.
+    변경된 경우 "articles" 는 임시 파일을 읽는 제너레이터이며,
+    ingest_document 가 소비하면서 배치 단위로 DB에 기록한다.
+
+    Returns: {"changed", "articles", "effective_date", "source_hash", "etag", "last_modified"}
+    """
+    state = get_document_source_state(law_info["name"], law_info["category"]) or {}
+    if not (state.get("source_hash") or "").startswith(f"{CRAWLER_PARSE_VERSION}:"):
+        # 현재 파싱 규칙으로 수집한 적이 없음 → 304 로 건너뛰지 않도록 검증자도 보내지 않음
+        state = {**state, "source_hash": None, "etag": None, "last_modified": None}
+    resp = _request_law(
+        law_info["name"], law_info["type"],
+        etag=state.get("etag"), last_modified=state.get("last_modified"),
+    )
+    result = {
+        "changed": False,
+        "articles": iter(()),
+        "effective_date": state.get("enacted_date"),
+        "source_hash": state.get("source_hash"),
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    if resp.status_code == 304:
+        resp.close()
+        return result
+
+    spool, source_hash = _spool_response(resp)
+    if state.get("source_hash") == source_hash:
+        spool.close()
+        return result
+
+    try:
+        effective_date = _find_effective_date(spool)
+    except BaseException:
+        spool.close()
+        raise
+    result.update(
+        changed=True, articles=_iter_spooled_articles(spool),
+        effective_date=effective_date, source_hash=source_hash,
+    )
+    return result
+
+
+def _store_law(law_info: dict, update: dict) -> tuple[bool, str]:
+    """fetch_law_update 결과를 DB에 저장하고 결과 메시지 반환. 변경 없으면 쓰기 생략."""
+    date_str = update["effective_date"] or "날짜 미상"
+    if not update["changed"]:
+        return True, f"✅ {law_info['name']} — 변경 없음 (시행일: {date_str})"
+
+    articles = update["articles"]
+    first = next(articles, None)
+    if first is None:
+        articles.close()
+        return False, f"⚠️ {law_info['name']}: 조문을 가져오지 못했습니다 (0개 수신)."
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for a in itertools.chain([first], articles):
+            count += 1
+            yield a
+
+    ingest_document(
+        doc_name=law_info["name"],
+        doc_category=law_info["category"],
+        filename="",
+        articles=counted(),
+        enacted_date=update["effective_date"],
+        source_type="crawler",
+        source_hash=update["source_hash"],
+        etag=update["etag"],
+        last_modified=update["last_modified"],
+    )
+
+    return True, f"✅ {law_info['name']} — {count}개 조문 (시행일: {date_str})"
+
+
+def _error_message(law_info: dict, e: Exception) -> str:
+    if isinstance(e, ValueError):
+        return f"❌ {law_info['name']}: {e}"
+    if isinstance(e, requests.RequestException):
+        return f"❌ {law_info['name']}: 네트워크 오류 — {e}"
+    if isinstance(e, ET.ParseError):
+        return f"❌ {law_info['name']}: 응답 파싱 오류 — {e}"
+    return f"❌ {law_info['name']}: 알 수 없는 오류 — {e}"
+
+
 def crawl_single_law(law_info: dict) -> tuple[bool, str]:
     """
-    단일 법령을 API로 수신하여 DB에 저장.
+    단일 법령을 API로 수신하여 변경된 경우에만 DB에 저장.
 
     Returns: (success, message)
     """
     try:
-        articles, effective_date = fetch_law_articles(
-            law_info["name"], law_info["type"]
-        )
+        return _store_law(law_info, fetch_law_update(law_info))
+    except Exception as e:
+        return False, _error_message(law_info, e)
 
-        if not articles:
-            return False, f"⚠️ {law_info['name']}: 조문을 가져오지 못했습니다 (0개 수신)."
 
-        doc_id = upsert_document(
-            doc_name=law_info["name"],
-            doc_category=law_info["category"],
-            filename="",
-            enacted_date=effective_date,
-            source_type="crawler",
-        )
-        insert_articles(doc_id, articles)
-        update_article_count(doc_id, len(articles))
-
-        date_str = effective_date or "날짜 미상"
-        return True, f"✅ {law_info['name']} — {len(articles)}개 조문 (시행일: {date_str})"
-
-    except ValueError as e:
-        return False, f"❌ {law_info['name']}: {e}"
-    except requests.RequestException as e:
-        return False, f"❌ {law_info['name']}: 네트워크 오류 — {e}"
-    except ET.ParseError as e:
-        return False, f"❌ {law_info['name']}: 응답 파싱 오류 — {e}"
-    except Exception as e:
-        return False, f"❌ {law_info['name']}: 알 수 없는 오류 — {e}"
+def crawl_laws(
+    laws: list[dict],
+    max_workers: int = CRAWL_MAX_WORKERS,
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+) -> list[tuple[bool, str]]:
+    """
+    여러 법령을 동시에 수신하고, DB 저장은 호출 스레드에서 하나씩 순차 수행.
+    - 수신: 스레드 풀(max_workers) + 공용 keep-alive 세션 + 호스트별 요청 간격 제한
+    - 저장: 수신 완료 순서대로 ingest_document 호출 (쓰기 직렬화)
+    on_progress(done, total, law_name) 은 저장이 끝날 때마다 호출 스레드에서 실행.
+
+    Returns: laws 와 같은 순서의 (success, message) 리스트
+    """
+    results: list[Optional[tuple[bool, str]]] = [None] * len(laws)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            pool.submit(fetch_law_update, law): i
+            for i, law in enumerate(laws)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            law = laws[i]
+            try:
+                results[i] = _store_law(law, future.result())
+            except Exception as e:
+                results[i] = (False, _error_message(law, e))
+            if on_progress:
+                on_progress(done, len(laws), law["name"])
+    return results
@@ -1,17 +1,106 @@
 import sqlite3
+import hashlib
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterable
+
+from normalize import NORMALIZE_VERSION, normalize_article_text
+from structure import LEVELS, article_key, extract_references, parse_heading, split_units
+from tokenizer import TOKENIZER_VERSION, deletion_variants, edit_distance, extract_terms, index_grams, initials
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "data", "regulations.db")
 
+# ── 커넥션 풀 설정 (환경변수로 조정 가능) ──────────────────────────────────
+# 풀에 보관할 최대 유휴 커넥션 수 (Streamlit 동시 세션 수 기준)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+# 메모리 매핑 크기 (bytes, 0이면 비활성)
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+# 페이지 캐시 크기 (음수 = KiB 단위, 기본 64MB)
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-65536"))
+# 쓰기 잠금 대기 시간 (ms) — 크롤러 쓰기 중 "database is locked" 방지
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))
 
-def get_conn():
-    conn = sqlite3.connect(DB_PATH)
+_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_pool_path = DB_PATH
+_pool_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    새 커넥션 생성 및 PRAGMA 설정.
+    - WAL: 크롤러 업데이트(쓰기) 중에도 다른 세션의 검색(읽기) 가능
+    - synchronous=NORMAL: WAL 모드에서 커밋마다 fsync 하지 않음
+    - index_grams(): 검색 인덱스 트리거가 호출하는 토크나이저 함수 등록
+    """
+    conn = sqlite3.connect(
+        DB_PATH, timeout=DB_BUSY_TIMEOUT / 1000, check_same_thread=False
+    )
     conn.row_factory = sqlite3.Row
+    conn.create_function("index_grams", 1, index_grams, deterministic=True)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
     conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = {DB_CACHE_SIZE}")
     return conn
 
 
+def _acquire() -> sqlite3.Connection:
+    global _pool, _pool_path
+    with _pool_lock:
+        if _pool_path != DB_PATH:
+            # DB 경로가 바뀐 경우 기존 풀 폐기
+            _close_pool()
+            _pool_path = DB_PATH
+        pool = _pool
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return _connect()
+
+
+def _release(conn: sqlite3.Connection):
+    if conn.in_transaction:
+        conn.rollback()
+    with _pool_lock:
+        pool = _pool if _pool_path == DB_PATH else None
+    if pool is None:
+        conn.close()
+        return
+    try:
+        pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def _close_pool():
+    global _pool
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+    _pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+@contextmanager
+def get_conn():
+    """
+    풀에서 커넥션을 빌려 트랜잭션 단위로 사용 후 반납.
+    블록이 정상 종료되면 commit, 예외 발생 시 rollback.
+    """
+    conn = _acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        _release(conn)
+
+
 def init_db():
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     with get_conn() as conn:
@@ -32,10 +121,19 @@ def init_db():
                 article_number TEXT,
                 article_title TEXT,
                 article_text TEXT NOT NULL,
-                page_number INTEGER
+                page_number INTEGER,
+                normalized_text TEXT,
+                content_hash TEXT,
+                seq INTEGER,
+                article_key TEXT
             );
 
             CREATE INDEX IF NOT EXISTS idx_articles_doc_id ON articles(doc_id);
+
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
         """)
         # 기존 DB에 컬럼이 없는 경우 마이그레이션
         cols = [r[1] for r in conn.execute("PRAGMA table_info(documents)").fetchall()]
@@ -43,103 +141,1006 @@ def init_db():
             conn.execute("ALTER TABLE documents ADD COLUMN enacted_date TEXT")
         if "source_type" not in cols:
             conn.execute("ALTER TABLE documents ADD COLUMN source_type TEXT NOT NULL DEFAULT 'pdf'")
+        # 크롤링 변경 감지용: 응답 본문 해시 + HTTP 검증자(ETag / Last-Modified)
+        for col in ("source_hash", "etag", "last_modified"):
+            if col not in cols:
+                conn.execute(f"ALTER TABLE documents ADD COLUMN {col} TEXT")
+        art_cols = [r[1] for r in conn.execute("PRAGMA table_info(articles)").fetchall()]
+        if "normalized_text" not in art_cols:
+            conn.execute("ALTER TABLE articles ADD COLUMN normalized_text TEXT")
+            _backfill_normalized_text(conn)
+        if "content_hash" not in art_cols:
+            conn.execute("ALTER TABLE articles ADD COLUMN content_hash TEXT")
+            _backfill_content_hash(conn)
+        if "seq" not in art_cols:
+            conn.execute("ALTER TABLE articles ADD COLUMN seq INTEGER")
+            # 기존 조문 순서(id 순)를 문서 내 순번으로 고정
+            conn.execute("""
+                UPDATE articles SET seq = (
+                    SELECT COUNT(*) FROM articles b
+                    WHERE b.doc_id = articles.doc_id AND b.id <= articles.id
+                )
+            """)
+        if "article_key" not in art_cols:
+            conn.execute("ALTER TABLE articles ADD COLUMN article_key TEXT")
+            _backfill_article_key(conn)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_doc_seq ON articles(doc_id, seq)")
+        # 조문 번호 바로가기·참조 해석: (문서, 조문 키) 로 O(log n) 조회
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_doc_key ON articles(doc_id, article_key)")
+        _init_search_index(conn)
+        _init_structure(conn)
+        if _get_meta(conn, "normalize_version") != NORMALIZE_VERSION:
+            _renormalize_all(conn)
+            _set_meta(conn, "normalize_version", NORMALIZE_VERSION)
+        _init_term_dictionary(conn)
+        _init_references(conn)
+
+
+def _backfill_normalized_text(conn: sqlite3.Connection, batch_size: int = 500):
+    """normalized_text 가 비어 있는 기존 조문을 일괄 정규화하여 채움."""
+    while True:
+        rows = conn.execute(
+            "SELECT id, article_text FROM articles WHERE normalized_text IS NULL LIMIT ?",
+            (batch_size,),
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE articles SET normalized_text = ? WHERE id = ?",
+            [(normalize_article_text(r["article_text"]), r["id"]) for r in rows],
+        )
+
+
+def _backfill_content_hash(conn: sqlite3.Connection, batch_size: int = 500):
+    """content_hash 가 비어 있는 기존 조문의 해시를 계산하여 채움."""
+    while True:
+        rows = conn.execute(
+            "SELECT id, article_title, article_text FROM articles WHERE content_hash IS NULL LIMIT ?",
+            (batch_size,),
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE articles SET content_hash = ? WHERE id = ?",
+            [(_article_hash(r["article_title"], r["article_text"]), r["id"]) for r in rows],
+        )
+
+
+def _backfill_article_key(conn: sqlite3.Connection, batch_size: int = 500):
+    """기존 조문의 article_key 를 조문 번호(없으면 본문 첫머리)로 계산하여 채움."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, article_number, article_text FROM articles WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "UPDATE articles SET article_key = ? WHERE id = ?",
+            [(article_key(r["article_number"], r["article_text"][:30]), r["id"]) for r in rows],
+        )
+        last_id = rows[-1]["id"]
+
+
+def _init_structure(conn: sqlite3.Connection):
+    """
+    편/장/절/조/항/호/목 계층 구조 테이블 (부모 포인터).
+    - 편/장/절: article_id NULL, seq = 바로 뒤 조문의 seq
+    - 조: start/end 가 조문 전체
+    - 항/호/목: articles.normalized_text 안의 문자 오프셋 구간 (본문 중복 저장 없음)
+    테이블이 새로 생성되면 기존 문서의 조/항/호/목 구조를 백필.
+    편/장/절 정보는 원문에서만 얻을 수 있으므로 다시 수집해야 채워짐
+    (크롤링 문서는 crawler.CRAWLER_PARSE_VERSION 이 source_hash 에 포함되어 다음 수집 때 자동 재반영,
+    PDF 문서는 다시 업로드).
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'structure_nodes'"
+    ).fetchone()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS structure_nodes (
+            id INTEGER PRIMARY KEY,
+            doc_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            parent_id INTEGER,
+            article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            label TEXT NOT NULL,
+            start_offset INTEGER,
+            end_offset INTEGER,
+            seq INTEGER NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_structure_article ON structure_nodes(article_id);
+        CREATE INDEX IF NOT EXISTS idx_structure_doc_seq ON structure_nodes(doc_id, seq);
+    """)
+    if not exists:
+        for r in conn.execute("SELECT id FROM documents").fetchall():
+            _rebuild_structure(conn, r["id"], {})
+
+
+def _stored_headings(conn: sqlite3.Connection, doc_id: int) -> dict[int, list[str]]:
+    """저장된 편/장/절/관 노드를 _rebuild_structure 입력 형식(seq → 제목 줄 목록)으로 복원."""
+    headings: dict[int, list[str]] = {}
+    for r in conn.execute(
+        "SELECT seq, label FROM structure_nodes"
+        " WHERE doc_id = ? AND article_id IS NULL ORDER BY seq, id",
+        (doc_id,),
+    ):
+        headings.setdefault(r["seq"], []).append(r["label"])
+    return headings
+
+
+def _heading_labels(headings_by_seq: dict[int, list[str]]) -> dict[int, list[str]]:
+    """수집한 제목 줄을 저장 형식(parse_heading label)으로 변환 — 저장된 노드와 비교용."""
+    labels: dict[int, list[str]] = {}
+    for seq, lines in headings_by_seq.items():
+        parsed = [h[1] for h in map(parse_heading, lines) if h]
+        if parsed:
+            labels[seq] = parsed
+    return labels
+
+
+def _renormalize_all(conn: sqlite3.Connection, batch_size: int = 500):
+    """
+    NORMALIZE_VERSION 변경 시 기존 조문의 normalized_text 를 다시 계산하고
+    바뀐 문서의 조/항/호/목 구조를 재생성 (편/장/절 노드는 저장된 제목을 그대로 유지).
+    """
+    changed_docs: set[int] = set()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, doc_id, article_text, normalized_text FROM articles"
+            " WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for r in rows:
+            text = normalize_article_text(r["article_text"])
+            if text != r["normalized_text"]:
+                updates.append((text, r["id"]))
+                changed_docs.add(r["doc_id"])
+        conn.executemany("UPDATE articles SET normalized_text = ? WHERE id = ?", updates)
+        last_id = rows[-1]["id"]
+    for doc_id in changed_docs:
+        _rebuild_structure(conn, doc_id, _stored_headings(conn, doc_id))
+    if changed_docs:
+        _bump_generation(conn)
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?)"
+        " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def _bump_generation(conn: sqlite3.Connection):
+    """
+    데이터 세대 번호 증가. 조문·문서를 바꾸는 모든 쓰기 트랜잭션 안에서 호출
+    → 검색 결과 캐시(search.py)가 세대 번호로 무효화 여부를 판단한다.
+    """
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES ('generation', '1')"
+        " ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+    )
+
+
+def get_generation() -> int:
+    """현재 데이터 세대 번호 (쓰기가 없었으면 0)."""
+    with get_conn() as conn:
+        value = _get_meta(conn, "generation")
+    return int(value) if value else 0
+
+
+def _init_search_index(conn: sqlite3.Connection):
+    """
+    조문 검색용 FTS5 인덱스(articles_kidx) 생성 및 articles 동기화 트리거 등록.
+    - 색인 토큰: index_grams(article_text) — tokenizer.index_grams 의 한글 bigram 토큰열
+    - 토큰열은 저장하지 않고 articles_search 뷰(external content)에서 그때그때 계산
+      → 커넥션마다 index_grams() 함수가 등록되어 있어야 함 (_connect)
+    - meta.tokenizer_version 이 TOKENIZER_VERSION 과 다르면 인덱스 재구축
+    이전 trigram 인덱스(articles_fts)는 제거한다.
+    """
+    conn.executescript("""
+        DROP TRIGGER IF EXISTS articles_fts_ai;
+        DROP TRIGGER IF EXISTS articles_fts_ad;
+        DROP TRIGGER IF EXISTS articles_fts_au;
+        DROP TABLE IF EXISTS articles_fts;
+
+        CREATE VIEW IF NOT EXISTS articles_search AS
+            SELECT id, index_grams(article_text) AS grams FROM articles;
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_kidx USING fts5(
+            grams,
+            content = 'articles_search',
+            content_rowid = 'id',
+            tokenize = 'unicode61'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS articles_kidx_ai AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_kidx (rowid, grams) VALUES (new.id, index_grams(new.article_text));
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS articles_kidx_ad AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_kidx (articles_kidx, rowid, grams)
+            VALUES ('delete', old.id, index_grams(old.article_text));
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS articles_kidx_au AFTER UPDATE OF article_text ON articles BEGIN
+            INSERT INTO articles_kidx (articles_kidx, rowid, grams)
+            VALUES ('delete', old.id, index_grams(old.article_text));
+            INSERT INTO articles_kidx (rowid, grams) VALUES (new.id, index_grams(new.article_text));
+        END;
+    """)
+    if _get_meta(conn, "tokenizer_version") != TOKENIZER_VERSION:
+        conn.execute("INSERT INTO articles_kidx (articles_kidx) VALUES ('rebuild')")
+        _set_meta(conn, "tokenizer_version", TOKENIZER_VERSION)
+        _bump_generation(conn)
+
+
+def _init_term_dictionary(conn: sqlite3.Connection):
+    """
+    초성·오타 허용 검색용 용어 사전.
+    - search_terms: 전체 문서의 용어(조사 제거 어간)와 초성 — initials 인덱스로 초성 접두어 조회
+    - term_variants: 3글자 이상 용어의 한 글자 삭제 변형 → 편집 거리 후보를 인덱스로 조회
+    - doc_terms: 문서별 용어 출현 수 (문서 삭제 시 CASCADE, 문서 빈도 집계용)
+    테이블이 새로 생성되면 기존 문서 전체로 백필.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_terms'"
+    ).fetchone()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS search_terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE,
+            initials TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS term_variants (
+            variant TEXT NOT NULL,
+            term_id INTEGER NOT NULL REFERENCES search_terms(id) ON DELETE CASCADE,
+            PRIMARY KEY (variant, term_id)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS doc_terms (
+            doc_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            term_id INTEGER NOT NULL REFERENCES search_terms(id) ON DELETE CASCADE,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (doc_id, term_id)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_search_terms_initials ON search_terms(initials);
+        CREATE INDEX IF NOT EXISTS idx_term_variants_term ON term_variants(term_id);
+        CREATE INDEX IF NOT EXISTS idx_doc_terms_term ON doc_terms(term_id);
+    """)
+    if not exists:
+        for r in conn.execute("SELECT id FROM documents").fetchall():
+            _rebuild_doc_terms(conn, r["id"])
+
+
+def _init_references(conn: sqlite3.Connection):
+    """
+    조문 간 참조 그래프 (source 조문 → 대상 문서명 + 조문 키).
+    대상은 id 가 아닌 (문서명, 조문 키) 로 저장하고 조회 시 idx_articles_doc_key 로 해석
+    → 대상 문서가 나중에 수집되거나 재수집으로 조문 id 가 바뀌어도 다시 계산할 필요 없음.
+    - 정방향(이 조문이 인용하는 조문): idx_article_refs_source
+    - 역방향(이 조문을 인용하는 조문): idx_article_refs_target
+    테이블이 새로 생성되면 기존 문서 전체로 백필.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_refs'"
+    ).fetchone()
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS article_refs (
+            source_article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            target_doc_name TEXT NOT NULL,
+            target_key TEXT NOT NULL,
+            target_unit TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (source_article_id, target_doc_name, target_key, target_unit)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_article_refs_target
+            ON article_refs(target_doc_name, target_key);
+        CREATE INDEX IF NOT EXISTS idx_documents_name ON documents(doc_name);
+    """)
+    if not exists:
+        for r in conn.execute("SELECT id, doc_name FROM documents").fetchall():
+            _rebuild_doc_refs(conn, r["id"], r["doc_name"])
 
 
 # ── 문서 CRUD ──────────────────────────────────────────────────────────────
 
-def upsert_document(
-    doc_name: str, doc_category: str, filename: str,
+def _article_hash(article_title: str | None, article_text: str) -> str:
+    """조문 제목+본문 해시. 재수집 시 변경 조문 판별용."""
+    return hashlib.sha256(
+        f"{article_title or ''}\x1f{article_text}".encode("utf-8")
+    ).hexdigest()
+
+
+def _upsert_document_row(
+    conn: sqlite3.Connection, doc_name: str, doc_category: str, filename: str,
+    enacted_date: str | None, source_type: str,
+) -> tuple[int, bool]:
+    """
+    documents 행 upsert (조문은 건드리지 않음). 호출자 트랜잭션 안에서 실행.
+    Returns: (doc_id, 새 문서이거나 파일명·시행일·출처가 바뀌었는지)
+    """
+    row = conn.execute(
+        "SELECT id, filename, enacted_date, source_type FROM documents"
+        " WHERE doc_name = ? AND doc_category = ?",
+        (doc_name, doc_category),
+    ).fetchone()
+    if row:
+        doc_id = row["id"]
+        changed = (row["filename"], row["enacted_date"], row["source_type"]) != (
+            filename, enacted_date, source_type
+        )
+        conn.execute(
+            "UPDATE documents SET filename = ?, uploaded_at = ?, enacted_date = ?, source_type = ? WHERE id = ?",
+            (filename, datetime.now().isoformat(), enacted_date, source_type, doc_id),
+        )
+    else:
+        cur = conn.execute(
+            "INSERT INTO documents (doc_name, doc_category, filename, enacted_date, source_type) VALUES (?, ?, ?, ?, ?)",
+            (doc_name, doc_category, filename, enacted_date, source_type),
+        )
+        doc_id = cur.lastrowid
+        changed = True
+    return doc_id, changed
+
+
+# 스트리밍 수집 시 한 번에 반영할 조문 수
+INGEST_BATCH_SIZE = 500
+
+_ARTICLE_UPDATE_SQL = """
+    UPDATE articles SET article_number = :article_number, article_title = :article_title,
+        article_text = :article_text, page_number = :page_number,
+        normalized_text = :normalized_text, content_hash = :content_hash, seq = :seq,
+        article_key = :article_key
+    WHERE id = :id
+"""
+_ARTICLE_MOVE_SQL = "UPDATE articles SET seq = ?, page_number = ? WHERE id = ?"
+_ARTICLE_INSERT_SQL = """
+    INSERT INTO articles
+        (doc_id, article_number, article_title, article_text, page_number,
+         normalized_text, content_hash, seq, article_key)
+    VALUES (:doc_id, :article_number, :article_title, :article_text, :page_number,
+            :normalized_text, :content_hash, :seq, :article_key)
+"""
+
+
+def _sync_article_rows(conn: sqlite3.Connection, doc_id: int, articles: Iterable[dict]) -> dict:
+    """
+    기존 조문과 신규 조문을 비교하여 변경분만 반영.
+    - 매칭 키: (조문번호, 동일 번호 내 출현 순서) → 부칙 제1조 등 중복 번호 대응
+    - 내용 해시가 같으면 유지(순번·페이지만 갱신), 다르면 UPDATE, 없으면 INSERT
+    - 신규 목록에 없는 기존 조문은 DELETE
+    조문 id 가 유지되므로 문서 뷰어 딥링크가 재수집 후에도 유효하다.
+    articles 는 제너레이터여도 되며, INGEST_BATCH_SIZE 단위로 나누어 반영한다.
+
+    Returns: {"total", "inserted", "updated", "deleted", "moved", "unchanged"} 건수
+             + {"headings": seq → 편/장/절 제목 목록} (구조 재생성용)
+    """
+    existing: dict[tuple[str, int], sqlite3.Row] = {}
+    occurrence: dict[str, int] = {}
+    for r in conn.execute(
+        "SELECT id, article_number, content_hash, page_number, seq FROM articles"
+        " WHERE doc_id = ? ORDER BY seq, id",
+        (doc_id,),
+    ):
+        number = r["article_number"] or ""
+        occurrence[number] = occurrence.get(number, 0) + 1
+        existing[(number, occurrence[number])] = r
+
+    stats = {"total": 0, "inserted": 0, "updated": 0, "deleted": 0, "moved": 0, "unchanged": 0,
+             "headings": {}}
+    inserts, updates, moves = [], [], []
+
+    def flush():
+        conn.executemany(_ARTICLE_UPDATE_SQL, updates)
+        conn.executemany(_ARTICLE_MOVE_SQL, moves)
+        conn.executemany(_ARTICLE_INSERT_SQL, inserts)
+        stats["inserted"] += len(inserts)
+        stats["updated"] += len(updates)
+        stats["moved"] += len(moves)
+        inserts.clear()
+        updates.clear()
+        moves.clear()
+
+    occurrence = {}
+    for seq, a in enumerate(articles, start=1):
+        stats["total"] = seq
+        if a.get("headings"):
+            stats["headings"][seq] = a["headings"]
+        number = a["article_number"] or ""
+        occurrence[number] = occurrence.get(number, 0) + 1
+        content_hash = _article_hash(a["article_title"], a["article_text"])
+        old = existing.pop((number, occurrence[number]), None)
+        if old is None:
+            inserts.append({
+                "doc_id": doc_id, **a, "seq": seq, "content_hash": content_hash,
+                "normalized_text": normalize_article_text(a["article_text"]),
+                "article_key": article_key(a["article_number"], a["article_text"][:30]),
+            })
+        elif old["content_hash"] != content_hash:
+            updates.append({
+                "id": old["id"], **a, "seq": seq, "content_hash": content_hash,
+                "normalized_text": normalize_article_text(a["article_text"]),
+                "article_key": article_key(a["article_number"], a["article_text"][:30]),
+            })
+        elif old["seq"] != seq or old["page_number"] != a["page_number"]:
+            moves.append((seq, a["page_number"], old["id"]))
+        if len(inserts) + len(updates) + len(moves) >= INGEST_BATCH_SIZE:
+            flush()
+    flush()
+
+    deletes = [(r["id"],) for r in existing.values()]
+    conn.executemany("DELETE FROM articles WHERE id = ?", deletes)
+    stats["deleted"] = len(deletes)
+    stats["unchanged"] = stats["total"] - stats["inserted"] - stats["updated"]
+    return stats
+
+
+def _rebuild_structure(
+    conn: sqlite3.Connection, doc_id: int, headings_by_seq: dict[int, list[str]],
+    batch_size: int = INGEST_BATCH_SIZE,
+):
+    """
+    문서의 structure_nodes 를 다시 생성.
+    headings_by_seq: 조문 seq → 그 조문 앞에 나온 편/장/절 제목 줄 목록.
+    노드 id 는 미리 계산하여 부모 포인터와 함께 executemany 로 일괄 삽입.
+    """
+    conn.execute("DELETE FROM structure_nodes WHERE doc_id = ?", (doc_id,))
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM structure_nodes").fetchone()[0]
+
+    rows: list[tuple] = []
+    heading_stack: list[tuple[int, int]] = []  # (계층 깊이, 노드 id)
+    articles = conn.execute(
+        "SELECT id, seq, article_number, normalized_text FROM articles"
+        " WHERE doc_id = ? ORDER BY seq, id",
+        (doc_id,),
+    )
+    for art in articles:
+        for line in headings_by_seq.get(art["seq"], []):
+            heading = parse_heading(line)
+            if not heading:
+                continue
+            kind, label = heading
+            while heading_stack and heading_stack[-1][0] >= LEVELS[kind]:
+                heading_stack.pop()
+            parent = heading_stack[-1][1] if heading_stack else None
+            rows.append((next_id, doc_id, parent, None, kind, label, None, None, art["seq"]))
+            heading_stack.append((LEVELS[kind], next_id))
+            next_id += 1
+
+        text = art["normalized_text"] or ""
+        article_node = next_id
+        rows.append((
+            article_node, doc_id, heading_stack[-1][1] if heading_stack else None,
+            art["id"], "조", art["article_number"] or "", 0, len(text), art["seq"],
+        ))
+        next_id += 1
+
+        units = split_units(text)
+        for i, u in enumerate(units):
+            parent = article_node if u["parent"] is None else next_id + u["parent"]
+            rows.append((
+                next_id + i, doc_id, parent, art["id"],
+                u["kind"], u["label"], u["start"], u["end"], art["seq"],
+            ))
+        next_id += len(units)
+
+        if len(rows) >= batch_size:
+            conn.executemany(_STRUCTURE_INSERT_SQL, rows)
+            rows.clear()
+    conn.executemany(_STRUCTURE_INSERT_SQL, rows)
+
+
+_STRUCTURE_INSERT_SQL = """
+    INSERT INTO structure_nodes
+        (id, doc_id, parent_id, article_id, kind, label, start_offset, end_offset, seq)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _rebuild_doc_terms(conn: sqlite3.Connection, doc_id: int):
+    """
+    문서의 doc_terms 를 다시 계산. 사전에 없는 용어는 search_terms·term_variants 에 추가하고,
+    어느 문서에도 쓰이지 않게 된 용어는 정리한다.
+    """
+    counts: dict[str, int] = {}
+    for r in conn.execute("SELECT article_text FROM articles WHERE doc_id = ?", (doc_id,)):
+        for term, n in extract_terms(r["article_text"]).items():
+            counts[term] = counts.get(term, 0) + n
+
+    conn.execute("DELETE FROM doc_terms WHERE doc_id = ?", (doc_id,))
+    known = {}
+    terms = list(counts)
+    for i in range(0, len(terms), 500):
+        chunk = terms[i:i + 500]
+        ph = ",".join("?" * len(chunk))
+        known.update(conn.execute(
+            f"SELECT term, id FROM search_terms WHERE term IN ({ph})", chunk
+        ).fetchall())
+    new_terms = [t for t in terms if t not in known]
+    if new_terms:
+        next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM search_terms").fetchone()[0]
+        for offset, term in enumerate(new_terms):
+            known[term] = next_id + offset
+        conn.executemany(
+            "INSERT INTO search_terms (id, term, initials) VALUES (?, ?, ?)",
+            [(known[t], t, initials(t)) for t in new_terms],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO term_variants (variant, term_id) VALUES (?, ?)",
+            [(v, known[t]) for t in new_terms if len(t) >= 3 for v in deletion_variants(t)],
+        )
+    conn.executemany(
+        "INSERT INTO doc_terms (doc_id, term_id, tf) VALUES (?, ?, ?)",
+        [(doc_id, known[t], n) for t, n in counts.items()],
+    )
+    _prune_terms(conn)
+
+
+def _rebuild_doc_refs(conn: sqlite3.Connection, doc_id: int, doc_name: str):
+    """문서 조문들의 참조를 다시 추출하여 article_refs 갱신."""
+    conn.execute(
+        "DELETE FROM article_refs WHERE source_article_id IN"
+        " (SELECT id FROM articles WHERE doc_id = ?)",
+        (doc_id,),
+    )
+    rows = []
+    for r in conn.execute(
+        "SELECT id, article_key, normalized_text FROM articles WHERE doc_id = ?", (doc_id,)
+    ):
+        for ref in extract_references(r["normalized_text"] or "", doc_name, r["article_key"]):
+            rows.append((r["id"], ref["doc_name"], ref["key"], ref["unit"]))
+    conn.executemany(
+        "INSERT OR IGNORE INTO article_refs"
+        " (source_article_id, target_doc_name, target_key, target_unit) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _prune_terms(conn: sqlite3.Connection):
+    """어느 문서에도 남아 있지 않은 용어 삭제 (term_variants 는 CASCADE)."""
+    conn.execute(
+        "DELETE FROM search_terms WHERE NOT EXISTS"
+        " (SELECT 1 FROM doc_terms WHERE doc_terms.term_id = search_terms.id)"
+    )
+
+
+def ingest_document(
+    doc_name: str, doc_category: str, filename: str, articles: Iterable[dict],
     enacted_date: str | None = None, source_type: str = "pdf",
+    source_hash: str | None = None, etag: str | None = None,
+    last_modified: str | None = None,
 ) -> int:
-    """동일 문서명+분류가 있으면 기존 조문 삭제 후 재삽입, 없으면 신규 삽입."""
+    """
+    문서 upsert + 조문 변경분 반영 + 조문 수 갱신을 단일 트랜잭션으로 수행.
+    중간에 실패하면 전체 롤백되어 기존 문서·조문이 그대로 유지된다.
+    source_hash/etag/last_modified 는 크롤링 변경 감지용으로 함께 저장.
+    articles 가 제너레이터이면 소비하면서 배치 단위로 기록한다.
+    """
+    with get_conn() as conn:
+        doc_id, doc_changed = _upsert_document_row(
+            conn, doc_name, doc_category, filename, enacted_date, source_type
+        )
+        stats = _sync_article_rows(conn, doc_id, articles)
+        text_changed = bool(stats["inserted"] or stats["updated"] or stats["deleted"])
+        structure_changed = (
+            text_changed or stats["moved"] > 0
+            or _heading_labels(stats["headings"]) != _stored_headings(conn, doc_id)
+        )
+        if structure_changed:
+            _rebuild_structure(conn, doc_id, stats["headings"])
+        if text_changed:
+            _rebuild_doc_terms(conn, doc_id)
+            _rebuild_doc_refs(conn, doc_id, doc_name)
+        # 내용이 그대로인 재수집은 세대를 올리지 않음 → 검색 캐시 유지
+        # (문서 목록의 수집 일시는 다음 세대 변경 때 갱신)
+        if structure_changed or doc_changed:
+            _bump_generation(conn)
+        conn.execute(
+            """UPDATE documents SET article_count = ?, source_hash = ?, etag = ?, last_modified = ?
+               WHERE id = ?""",
+            (stats["total"], source_hash, etag, last_modified, doc_id),
+        )
+    return doc_id
+
+
+def get_document_source_state(doc_name: str, doc_category: str) -> dict | None:
+    """크롤링 변경 감지용 저장 상태 (enacted_date, source_hash, etag, last_modified)."""
     with get_conn() as conn:
         row = conn.execute(
-            "SELECT id FROM documents WHERE doc_name = ? AND doc_category = ?",
+            """SELECT id, enacted_date, source_hash, etag, last_modified FROM documents
+               WHERE doc_name = ? AND doc_category = ?""",
             (doc_name, doc_category),
         ).fetchone()
-        if row:
-            doc_id = row["id"]
-            conn.execute("DELETE FROM articles WHERE doc_id = ?", (doc_id,))
-            conn.execute(
-                "UPDATE documents SET filename = ?, uploaded_at = ?, enacted_date = ?, source_type = ? WHERE id = ?",
-                (filename, datetime.now().isoformat(), enacted_date, source_type, doc_id),
-            )
-        else:
-            cur = conn.execute(
-                "INSERT INTO documents (doc_name, doc_category, filename, enacted_date, source_type) VALUES (?, ?, ?, ?, ?)",
-                (doc_name, doc_category, filename, enacted_date, source_type),
-            )
-            doc_id = cur.lastrowid
-    return doc_id
+    return dict(row) if row else None
 
 
-def update_article_count(doc_id: int, count: int):
+def delete_document(doc_id: int):
     with get_conn() as conn:
-        conn.execute(
-            "UPDATE documents SET article_count = ? WHERE id = ?", (count, doc_id)
-        )
+        conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        _prune_terms(conn)
+        _bump_generation(conn)
+
+
+# ── 문서 목록 캐시 ─────────────────────────────────────────────────────────
+# 문서 관리·조문 뷰어는 Streamlit 재실행마다 문서 목록을 다시 읽으므로
+# 프로세스 공용 목록을 데이터 세대 번호(meta.generation)로 검증하여 재사용한다.
+# (ingest_document / delete_document 가 세대 번호를 올리면 다음 조회 때 다시 읽음)
 
+_CATALOG_COLUMNS = (
+    "id, doc_name, doc_category, filename, source_type, article_count,"
+    " enacted_date, uploaded_at"
+)
+_catalog_lock = threading.Lock()
+_catalog = {"key": None, "docs": [], "by_id": {}}    # key = (DB 경로, 세대 번호)
 
-def insert_articles(doc_id: int, articles: list[dict]):
+
+def _load_catalog() -> dict:
+    """세대 번호가 바뀌었으면 documents 를 다시 읽어 목록 캐시 갱신 (단일 연결에서 세대 확인+조회)."""
     with get_conn() as conn:
-        conn.executemany(
-            """INSERT INTO articles (doc_id, article_number, article_title, article_text, page_number)
-               VALUES (:doc_id, :article_number, :article_title, :article_text, :page_number)""",
-            [{"doc_id": doc_id, **a} for a in articles],
-        )
+        value = _get_meta(conn, "generation")
+        key = (DB_PATH, int(value) if value else 0)
+        with _catalog_lock:
+            if _catalog["key"] == key:
+                return _catalog
+        rows = conn.execute(
+            f"SELECT {_CATALOG_COLUMNS} FROM documents ORDER BY uploaded_at DESC"
+        ).fetchall()
+    docs = [dict(r) for r in rows]
+    with _catalog_lock:
+        _catalog.update(key=key, docs=docs, by_id={d["id"]: d for d in docs})
+        return _catalog
 
 
 def get_all_documents() -> list[dict]:
+    """등록 문서 목록 (최근 수집 순). 캐시된 목록의 사본을 반환."""
+    return [dict(d) for d in _load_catalog()["docs"]]
+
+
+def get_document_map() -> dict[int, dict]:
+    """doc_id → 문서 메타데이터 (이름·분류·출처·조문 수·날짜). 공용 캐시이므로 읽기 전용으로 사용."""
+    return _load_catalog()["by_id"]
+
+
+def get_document_by_id(doc_id: int) -> dict | None:
+    doc = get_document_map().get(doc_id)
+    return dict(doc) if doc else None
+
+
+# ── 조문·구조 조회 ─────────────────────────────────────────────────────────
+
+def get_article_units(article_ids: list[int]) -> dict[int, list[dict]]:
+    """조문 id 목록 → {article_id: [조/항/호/목 노드]} (검색 결과 단위 위치 계산용)."""
+    if not article_ids:
+        return {}
+    ph = ",".join("?" * len(article_ids))
     with get_conn() as conn:
         rows = conn.execute(
-            "SELECT * FROM documents ORDER BY uploaded_at DESC"
+            f"SELECT * FROM structure_nodes WHERE article_id IN ({ph}) ORDER BY start_offset, id",
+            list(article_ids),
         ).fetchall()
-    return [dict(r) for r in rows]
+    units: dict[int, list[dict]] = {}
+    for r in rows:
+        units.setdefault(r["article_id"], []).append(dict(r))
+    return units
 
 
-def delete_document(doc_id: int):
+def get_article_by_id(article_id: int) -> dict | None:
+    """조문 한 건 전체 (본문 + 문서명·분류·시행일). 검색 결과 보조 패널이 선택 시점에 조회."""
     with get_conn() as conn:
-        conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        row = conn.execute(
+            """SELECT a.*, d.doc_name, d.doc_category, d.source_type, d.enacted_date
+               FROM articles a JOIN documents d ON a.doc_id = d.id
+               WHERE a.id = ?""",
+            (article_id,),
+        ).fetchone()
+    return dict(row) if row else None
 
 
-def get_document_by_id(doc_id: int) -> dict | None:
+def get_article_position(article_id: int) -> dict | None:
+    """조문 id → {"doc_id", "seq"} (조문 뷰어가 대상 조문 주변 구간을 잡을 때 사용)."""
     with get_conn() as conn:
         row = conn.execute(
-            "SELECT * FROM documents WHERE id = ?", (doc_id,)
+            "SELECT doc_id, seq FROM articles WHERE id = ?", (article_id,)
         ).fetchone()
     return dict(row) if row else None
 
 
-def get_articles_by_doc_id(doc_id: int) -> list[dict]:
+def get_article_window(doc_id: int, seq_from: int, seq_to: int) -> tuple[list[dict], list[dict]]:
+    """
+    문서의 seq 구간 [seq_from, seq_to] 조문과 그 앞 편/장/절 제목 노드.
+    idx_articles_doc_seq / idx_structure_doc_seq 범위 조회 → 문서 크기와 무관하게 구간 크기만큼만 읽음.
+    Returns: (조문 목록, 제목 노드 목록) — 둘 다 seq 순
+    """
+    with get_conn() as conn:
+        articles = conn.execute(
+            "SELECT * FROM articles WHERE doc_id = ? AND seq BETWEEN ? AND ? ORDER BY seq, id",
+            (doc_id, seq_from, seq_to),
+        ).fetchall()
+        headings = conn.execute(
+            """SELECT * FROM structure_nodes
+               WHERE doc_id = ? AND seq BETWEEN ? AND ? AND article_id IS NULL
+               ORDER BY seq, id""",
+            (doc_id, seq_from, seq_to),
+        ).fetchall()
+    return [dict(r) for r in articles], [dict(r) for r in headings]
+
+
+# ── 조문 번호 조회 ─────────────────────────────────────────────────────────
+
+def find_documents_by_name(name: str) -> list[dict]:
+    """문서명 정확히 일치 → 없으면 부분 일치 (짧은 이름 우선)."""
+    with get_conn() as conn:
+        rows = conn.execute(
+            "SELECT id, doc_name, doc_category FROM documents WHERE doc_name = ?", (name,)
+        ).fetchall()
+        if not rows:
+            rows = conn.execute(
+                """SELECT id, doc_name, doc_category FROM documents
+                   WHERE REPLACE(doc_name, ' ', '') LIKE ?
+                   ORDER BY LENGTH(doc_name)""",
+                (f"%{name.replace(' ', '')}%",),
+            ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def find_articles_by_key(key: str, doc_ids: list[int] | None = None) -> list[dict]:
+    """
+    조문 키("9-2")로 조문 조회 (idx_articles_doc_key). 문서마다 가장 앞(seq) 조문 하나.
+    부칙의 같은 번호 조문보다 본칙 조문이 먼저 나오므로 본칙이 선택된다.
+    doc_ids 가 없으면 전체 문서 대상 (문서별 인덱스 탐색).
+    """
+    if doc_ids is None:
+        doc_filter, params = "SELECT id FROM documents", [key]
+    else:
+        if not doc_ids:
+            return []
+        doc_filter, params = ",".join("?" * len(doc_ids)), [key] + list(doc_ids)
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""SELECT a.id, a.doc_id, a.article_number, a.article_title, a.article_text,
+                       a.normalized_text, a.page_number, MIN(a.seq) AS seq,
+                       d.doc_name, d.doc_category, d.source_type, d.enacted_date
+                FROM articles a JOIN documents d ON d.id = a.doc_id
+                WHERE a.article_key = ? AND a.doc_id IN ({doc_filter})
+                GROUP BY a.doc_id
+                ORDER BY d.doc_name""",
+            params,
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+# ── 조문 참조 조회 ─────────────────────────────────────────────────────────
+
+def get_article_references(article_id: int) -> list[dict]:
+    """
+    이 조문이 인용하는 조문 목록 (정방향, 같은 문서 조문 먼저). 대상 조문은 (문서명, 조문 키) 인덱스로 해석.
+    대상 문서·조문이 DB에 없으면 id 등은 None (인용 표기만 표시 가능).
+    Returns: [{"target_doc_name", "target_key", "target_unit", "id", "doc_id",
+               "article_number", "article_title"}]
+    """
+    with get_conn() as conn:
+        rows = conn.execute(
+            """SELECT r.target_doc_name, r.target_key, r.target_unit,
+                      a.id, a.doc_id, a.article_number, a.article_title, MIN(a.seq) AS seq
+               FROM article_refs r
+               LEFT JOIN documents d ON d.doc_name = r.target_doc_name
+               LEFT JOIN articles a ON a.doc_id = d.id AND a.article_key = r.target_key
+               WHERE r.source_article_id = ?
+               GROUP BY r.target_doc_name, r.target_key, r.target_unit
+               ORDER BY r.target_doc_name != ?, r.target_doc_name,
+                        CAST(r.target_key AS INTEGER), r.target_key, r.target_unit""",
+            (article_id, _doc_name_of(conn, article_id)),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _doc_name_of(conn: sqlite3.Connection, article_id: int) -> str | None:
+    row = conn.execute(
+        "SELECT d.doc_name FROM articles a JOIN documents d ON d.id = a.doc_id WHERE a.id = ?",
+        (article_id,),
+    ).fetchone()
+    return row["doc_name"] if row else None
+
+
+def get_referencing_articles(article_id: int) -> list[dict]:
+    """
+    이 조문을 인용하는 조문 목록 (역방향, idx_article_refs_target).
+    같은 번호의 부칙 조문 등 (문서명, 조문 키) 의 대표 조문이 아니면 빈 목록.
+    Returns: [{"id", "doc_id", "article_number", "article_title", "doc_name", "doc_category",
+               "target_unit"}] 문서명·조문 순
+    """
     with get_conn() as conn:
+        target = conn.execute(
+            """SELECT d.doc_name, a.article_key FROM articles a
+               JOIN documents d ON d.id = a.doc_id
+               WHERE a.id = ? AND a.seq = (
+                   SELECT MIN(seq) FROM articles WHERE doc_id = a.doc_id AND article_key = a.article_key
+               )""",
+            (article_id,),
+        ).fetchone()
+        if target is None or target["article_key"] is None:
+            return []
         rows = conn.execute(
-            "SELECT * FROM articles WHERE doc_id = ? ORDER BY id", (doc_id,)
+            """SELECT a.id, a.doc_id, a.article_number, a.article_title,
+                      d.doc_name, d.doc_category,
+                      GROUP_CONCAT(NULLIF(r.target_unit, ''), ', ') AS target_unit
+               FROM article_refs r
+               JOIN articles a ON a.id = r.source_article_id
+               JOIN documents d ON d.id = a.doc_id
+               WHERE r.target_doc_name = ? AND r.target_key = ? AND a.id != ?
+               GROUP BY a.id
+               ORDER BY d.doc_name, a.seq""",
+            (target["doc_name"], target["article_key"], article_id),
         ).fetchall()
     return [dict(r) for r in rows]
 
 
 # ── 검색 ───────────────────────────────────────────────────────────────────
 
-def search_articles(keyword: str, categories: list[str] | None = None) -> list[dict]:
-    if not keyword.strip():
-        return []
+def _search_source(plan: dict) -> tuple[str, str, str, list]:
+    """
+    검색 계획(search.parse_query) → (FROM 절, WHERE 절, ORDER BY 절, 파라미터).
+    - phrase 가 있는 OR 그룹·제외어는 하나의 FTS5 MATCH 식으로 결합 → 인덱스 안에서 posting list 교집합/차집합
+    - bigram 인덱스로 표현할 수 없는 항목(1글자 한글 등)만 LIKE 조건으로 추가
+    - FTS 로 처리할 긍정 그룹이 없으면 조문 전체를 LIKE 로 스캔
+    """
+    match_groups: list[str] = []
+    conds: list[str] = []
+    params: list = []
+    for group in plan["groups"]:
+        if all(t["phrase"] for t in group):
+            match_groups.append("(" + " OR ".join(t["phrase"] for t in group) + ")")
+        else:
+            conds.append("(" + " OR ".join("a.article_text LIKE ?" for _ in group) + ")")
+            params += [f"%{t['text']}%" for t in group]
 
-    placeholders = ""
-    params: list = [f"%{keyword}%"]
+    excludes = plan["excludes"]
+    if match_groups:
+        fts_excludes = [t["phrase"] for t in excludes if t["phrase"]]
+        excludes = [t for t in excludes if not t["phrase"]]
+    for t in excludes:
+        conds.append("a.article_text NOT LIKE ?")
+        params.append(f"%{t['text']}%")
+
+    for value, negated in plan["doc_filters"]:
+        conds.append("d.doc_name " + ("NOT LIKE ?" if negated else "LIKE ?"))
+        params.append(f"%{value}%")
+    for value, negated in plan["cat_filters"]:
+        conds.append("d.doc_category " + ("!= ?" if negated else "= ?"))
+        params.append(value)
+
+    if not match_groups:
+        where = " AND ".join(conds) or "1"
+        return "articles a", where, "d.doc_name, a.seq", params
 
+    match = " AND ".join(match_groups)
+    if fts_excludes:
+        match = f"({match}) NOT ({' OR '.join(fts_excludes)})"
+    where = " AND ".join(["articles_kidx MATCH ?"] + conds)
+    return (
+        "articles_kidx f JOIN articles a ON a.id = f.rowid",
+        where,
+        "bm25(articles_kidx), d.doc_name, a.seq",
+        [match] + params,
+    )
+
+
+def search_articles_page(
+    plan: dict, categories: list[str] | None = None,
+    limit: int = 10, offset: int = 0,
+) -> tuple[list[dict], int, dict[str, int]]:
+    """
+    관련도(BM25) 순 검색 결과 한 페이지만 조회.
+    plan: search.parse_query 결과 (AND/OR 그룹, 제외어, 문서·분류 필터)
+
+    Returns: (rows, total, category_counts)
+    - rows: LIMIT/OFFSET 적용된 현재 페이지 결과 (원문 article_text 제외 — 스니펫·단위 계산용 normalized_text 만)
+    - total: 선택 분류 기준 전체 결과 수
+    - category_counts: 분류 필터(체크박스)와 무관한 분류별 결과 수
+    """
+    if not (plan["groups"] or plan["doc_filters"] or plan["cat_filters"]):
+        return [], 0, {}
+
+    source, where, order_by, params = _search_source(plan)
+
+    count_sql = f"""
+        SELECT d.doc_category, COUNT(*) AS cnt
+        FROM {source}
+        JOIN documents d ON a.doc_id = d.id
+        WHERE {where}
+        GROUP BY d.doc_category
+    """
+
+    placeholders = ""
+    page_params = list(params)
     if categories:
         ph = ",".join("?" * len(categories))
         placeholders = f" AND d.doc_category IN ({ph})"
-        params += categories
+        page_params += categories
 
-    sql = f"""
-        SELECT a.id, a.doc_id, a.article_number, a.article_title, a.article_text, a.page_number,
-               d.doc_name, d.doc_category, d.filename, d.source_type, d.enacted_date
-        FROM articles a
+    page_sql = f"""
+        SELECT a.id, a.doc_id, a.article_number, a.article_title, a.page_number,
+               a.normalized_text, d.doc_name, d.doc_category, d.source_type, d.enacted_date
+        FROM {source}
         JOIN documents d ON a.doc_id = d.id
-        WHERE a.article_text LIKE ?{placeholders}
-        ORDER BY d.doc_name, a.id
+        WHERE {where}{placeholders}
+        ORDER BY {order_by}
+        LIMIT ? OFFSET ?
     """
     with get_conn() as conn:
-        rows = conn.execute(sql, params).fetchall()
-    return [dict(r) for r in rows]
+        category_counts = {
+            r["doc_category"]: r["cnt"] for r in conn.execute(count_sql, params).fetchall()
+        }
+        rows = conn.execute(page_sql, page_params + [limit, offset]).fetchall()
+
+    if categories:
+        total = sum(category_counts.get(c, 0) for c in categories)
+    else:
+        total = sum(category_counts.values())
+    return [dict(r) for r in rows], total, category_counts
+
+
+# ── 용어 사전 조회 (초성·오타 허용 검색) ─────────────────────────────────────
+
+def find_terms_by_initials(initials_prefix: str, limit: int = 10) -> list[dict]:
+    """
+    초성 접두어로 용어 조회 (idx_search_terms_initials 범위 검색).
+    CROSS JOIN 으로 사전 → doc_terms 순서를 고정 (통계 없이도 doc_terms 전체 스캔 방지).
+    Returns: [{"term", "df"}] 문서 빈도 내림차순
+    """
+    with get_conn() as conn:
+        rows = conn.execute(
+            """SELECT t.term, COUNT(dt.doc_id) AS df, SUM(dt.tf) AS tf
+               FROM search_terms t CROSS JOIN doc_terms dt ON dt.term_id = t.id
+               WHERE t.initials >= ? AND t.initials < ?
+               GROUP BY t.id
+               ORDER BY df DESC, tf DESC, LENGTH(t.term)
+               LIMIT ?""",
+            (initials_prefix, initials_prefix + "\uffff", limit),
+        ).fetchall()
+    return [{"term": r["term"], "df": r["df"]} for r in rows]
+
+
+def find_similar_terms(term: str, max_edits: int = 1, limit: int = 10) -> list[dict]:
+    """
+    편집 거리 max_edits 이하 용어 조회 (자기 자신 포함, distance 0).
+    한 글자 삭제 변형(term_variants)이 겹치는 후보만 인덱스로 가져와 거리를 확정 →
+    사전 전체를 훑지 않는다. 3글자 이상 용어만 대상.
+    Returns: [{"term", "distance", "df"}] 거리 오름차순, 문서 빈도 내림차순
+    """
+    if len(term) < 3:
+        return []
+    keys = sorted(deletion_variants(term) | {term})
+    ph = ",".join("?" * len(keys))
+    with get_conn() as conn:
+        rows = conn.execute(
+            f"""SELECT t.term, COUNT(dt.doc_id) AS df
+                FROM search_terms t CROSS JOIN doc_terms dt ON dt.term_id = t.id
+                WHERE t.id IN (
+                    SELECT term_id FROM term_variants WHERE variant IN ({ph})
+                    UNION SELECT id FROM search_terms WHERE term IN ({ph})
+                )
+                GROUP BY t.id""",
+            keys + keys,
+        ).fetchall()
+    found = []
+    for r in rows:
+        distance = edit_distance(term, r["term"], max_edits)
+        if distance <= max_edits:
+            found.append({"term": r["term"], "distance": distance, "df": r["df"]})
+    found.sort(key=lambda f: (f["distance"], -f["df"]))
+    return found[:limit]
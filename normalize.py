@@ -0,0 +1,43 @@
+"""
+조문 텍스트 정규화 모듈.
+수집(ingest) 시점에 한 번 실행하여 articles.normalized_text 에 저장하고,
+화면 렌더링 시에는 저장된 값을 그대로 사용한다.
+"""
+import re
+
+_PARAGRAPH_START = re.compile(
+    r"^[①-⑳]|^\d+(?:의\d+)?\.\s|^[가나다라마바사아자차카타파하]\.\s"
+)
+_MULTI_SPACE = re.compile(r"[ \t]{2,}")
+
+# 정규화 규칙이 바뀌면 NORMALIZE_VERSION 을 올릴 것
+# → init_db 가 기존 조문의 normalized_text 와 structure_nodes 를 다시 계산
+NORMALIZE_VERSION = "2"
+
+
+def normalize_article_text(text: str) -> str:
+    """
+    조문 텍스트 정규화.
+    - PDF 레이아웃 행바꿈(의미 없는 줄바꿈)은 공백으로 연결
+    - 항/호/목 번호(①②③, 1. 1의2., 가. 나.) 앞 줄바꿈만 유지
+    - 연속 공백 제거
+    조각을 리스트에 모아 마지막에 한 번만 join (문자열 누적 연결 없음).
+    """
+    parts: list[str] = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if parts:
+                parts.append("\n")  # 빈 줄은 단락 구분으로 유지
+            continue
+        if not parts:
+            parts.append(stripped)
+        elif _PARAGRAPH_START.match(stripped):
+            parts.append("\n")
+            parts.append(stripped)
+        elif parts[-1].endswith("-"):
+            parts[-1] = parts[-1][:-1] + stripped   # 하이픈 단어 분리 복원
+        else:
+            parts.append(" ")
+            parts.append(stripped)
+    return _MULTI_SPACE.sub(" ", "".join(parts))
@@ -2,66 +2,234 @@
 PDF에서 텍스트를 추출하고 조문 단위로 파싱하는 모듈.
 조문 패턴: 제X조, 제X조의X
 조문 제목 패턴: 제X조(제목) 또는 제X조 (제목)
+텍스트 추출 백엔드: PyMuPDF (기본, 빠름) / pdfplumber (대체)
 """
+import hashlib
+import io
+import json
+import multiprocessing
+import os
 import re
-from typing import IO
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Iterable, Iterator
 
 import pdfplumber
 
+from structure import parse_heading
+
+try:
+    import pymupdf
+except ImportError:  # 구버전 PyMuPDF 는 fitz 모듈명만 제공
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
 # 조문 시작 패턴 (전체 줄이 조문 번호로 시작하는 경우)
 ARTICLE_PATTERN = re.compile(r"^(제\s*\d+조(?:의\s*\d+)?)")
 # 조문 제목 포함 패턴
 TITLE_PATTERN = re.compile(r"제\s*\d+조(?:의\s*\d+)?\s*[（(]([^）)\n]+)[）)]")
 # 목차 항목 판별: 점선(...··) 또는 탭+숫자(페이지번호) 패턴
 TOC_PATTERN = re.compile(r"[.·‥…]{3,}|\.{2,}\s*\d+\s*$")
+# 문장이 끝난 본문: "…한다." / "…<개정 2015. 7. 24.>" / "삭제" 등 → 다음 줄이 편/장/절 제목일 수 있음
+SENTENCE_END = re.compile(r"(?:[.。>\]]|삭제)$")
 # 단락 구분자: 항/호/목 번호로 시작하는 줄 → 앞에 줄바꿈 삽입
-PARAGRAPH_START = re.compile(r"^[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮]|^\d+\.\s|^[가나다라마바사아자차카타파하]\.\s")
+PARAGRAPH_START = re.compile(r"^[①-⑳]|^\d+(?:의\d+)?\.\s|^[가나다라마바사아자차카타파하]\.\s")
+
+
+# 추출 백엔드 (환경변수 PDF_BACKEND 로 변경 가능)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pymupdf")
+# 병렬 추출 프로세스 수 (1이면 항상 순차 추출)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 이 페이지 수 미만이면 프로세스 풀 기동 비용이 더 커서 순차 추출
+# (spawn 작업자는 기동 때 이 모듈과 PDF 라이브러리를 새로 import — 작업자당 약 0.3초)
+PARALLEL_MIN_PAGES = 100
+
+# 파싱 결과 캐시 (PDF 원본이 아닌 파싱된 조문만 저장)
+# 파싱 규칙·출력 형식이 바뀌면 PARSER_VERSION 을 올려 기존 캐시를 무효화할 것
+PARSER_VERSION = "4"
+PARSE_CACHE_DIR = os.getenv(
+    "PARSE_CACHE_DIR", os.path.join(os.path.dirname(__file__), "data", "parse_cache")
+)
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
 
 
-def extract_text_by_page(pdf_file: IO[bytes]) -> list[tuple[int, str]]:
-    """PDF 파일 객체에서 (page_number, text) 리스트 반환."""
+def _pdfplumber_page_count(pdf_data: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(pdf_data)) as pdf:
+        return len(pdf.pages)
+
+
+def _pdfplumber_page_range(pdf_data: bytes, start: int, end: int) -> list[tuple[int, str]]:
     pages = []
-    try:
-        with pdfplumber.open(pdf_file) as pdf:
-            for i, page in enumerate(pdf.pages, start=1):
-                text = page.extract_text() or ""
-                pages.append((i, text))
-    except Exception as e:
-        raise ValueError(f"PDF 텍스트 추출 실패: {e}") from e
+    with pdfplumber.open(io.BytesIO(pdf_data)) as pdf:
+        for i in range(start, end):
+            page = pdf.pages[i]
+            pages.append((i + 1, page.extract_text() or ""))
+            page.close()  # 페이지별 레이아웃 캐시 해제
+    return pages
+
+
+def _pymupdf_page_count(pdf_data: bytes) -> int:
+    with pymupdf.open(stream=pdf_data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _pymupdf_page_range(pdf_data: bytes, start: int, end: int) -> list[tuple[int, str]]:
+    pages = []
+    with pymupdf.open(stream=pdf_data, filetype="pdf") as doc:
+        for i in range(start, end):
+            # sort=True: 블록을 좌상단→우하단 순으로 정렬 (pdfplumber 와 같은 읽기 순서)
+            pages.append((i + 1, doc[i].get_text("text", sort=True)))
     return pages
 
 
+# 백엔드 이름 → (페이지 수 함수, 페이지 구간 추출 함수)
+EXTRACT_BACKENDS = {
+    "pymupdf":    (_pymupdf_page_count, _pymupdf_page_range),
+    "pdfplumber": (_pdfplumber_page_count, _pdfplumber_page_range),
+}
+
+
+def _extract_page_range(
+    pdf_data: bytes, start: int, end: int, backend: str
+) -> list[tuple[int, str]]:
+    """pages[start:end] 구간의 (page_number, text) 리스트."""
+    return EXTRACT_BACKENDS[backend][1](pdf_data, start, end)
+
+
+# 프로세스 풀 작업자에 한 번만 전달된 PDF 원본 (작업마다 bytes 를 다시 피클링하지 않도록)
+_worker_pdf_data: bytes | None = None
+
+
+def _init_worker(pdf_data: bytes):
+    global _worker_pdf_data
+    _worker_pdf_data = pdf_data
+
+
+def _extract_worker_range(start: int, end: int, backend: str) -> list[tuple[int, str]]:
+    """프로세스 풀 작업 단위: 작업자 초기화 때 받은 PDF 의 pages[start:end] 추출."""
+    return _extract_page_range(_worker_pdf_data, start, end, backend)
+
+
+def _split_ranges(page_count: int, parts: int) -> list[tuple[int, int]]:
+    """0..page_count 를 parts 개의 연속 구간으로 분할."""
+    size, rest = divmod(page_count, parts)
+    ranges, start = [], 0
+    for k in range(parts):
+        end = start + size + (1 if k < rest else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _extract_with_backend(
+    pdf_data: bytes, backend: str, workers: int
+) -> list[tuple[int, str]]:
+    page_count = EXTRACT_BACKENDS[backend][0](pdf_data)
+
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        return _extract_page_range(pdf_data, 0, page_count, backend)
+
+    # 작업 불균형 완화를 위해 프로세스 수의 2배 구간으로 분할
+    # spawn: 멀티스레드인 Streamlit 서버에서 fork 하면 다른 스레드가 쥔 잠금을 물려받아 교착될 수 있음
+    # PDF 원본은 initializer 로 작업자마다 한 번만 전달
+    ranges = _split_ranges(page_count, workers * 2)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(pdf_data,),
+    ) as pool:
+        chunks = pool.map(
+            _extract_worker_range,
+            [s for s, _ in ranges],
+            [e for _, e in ranges],
+            [backend] * len(ranges),
+        )
+        return [page for chunk in chunks for page in chunk]
+
+
+def _backend_order(backend: str | None) -> list[str]:
+    """사용할 백엔드 순서. PyMuPDF 미설치 시 pdfplumber 만 사용."""
+    backend = backend or PDF_BACKEND
+    if backend not in EXTRACT_BACKENDS:
+        raise ValueError(f"알 수 없는 PDF 추출 백엔드: {backend}")
+    order = [backend] + [b for b in EXTRACT_BACKENDS if b != backend]
+    if pymupdf is None:
+        order.remove("pymupdf")
+    return order
+
+
+def extract_text_by_page(
+    pdf_file: IO[bytes], workers: int | None = None, backend: str | None = None,
+) -> list[tuple[int, str]]:
+    """
+    PDF 파일 객체에서 (page_number, text) 리스트 반환.
+    - backend: "pymupdf" | "pdfplumber" (미지정 시 PDF_BACKEND).
+      선택한 백엔드가 실패하면 나머지 백엔드로 재시도
+    - 페이지 수가 PARALLEL_MIN_PAGES 이상이고 workers > 1 이면 페이지 구간을
+      프로세스 풀에 나누어 추출한 뒤 페이지 순서대로 합친다.
+      workers 미지정 시 PDF_WORKERS (환경변수) 사용.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    pdf_file.seek(0)
+    pdf_data = pdf_file.read()
+
+    error: Exception | None = None
+    for name in _backend_order(backend):
+        try:
+            return _extract_with_backend(pdf_data, name, workers)
+        except Exception as e:
+            error = e
+    raise ValueError(f"PDF 텍스트 추출 실패: {error}") from error
+
+
 def _normalize_article_number(raw: str) -> str:
     """공백 제거하여 '제3조의2' 형태로 정규화."""
     return re.sub(r"\s+", "", raw)
 
 
-def parse_articles(pages: list[tuple[int, str]]) -> list[dict]:
-    """
-    페이지별 텍스트를 받아 조문 단위 dict 리스트 반환.
-    각 dict: {article_number, article_title, article_text, page_number}
-    """
-    # 전체 텍스트를 (page_number, line) 형태로 펼침
-    all_lines: list[tuple[int, str]] = []
+def _iter_lines(pages: Iterable[tuple[int, str]]) -> Iterator[tuple[int, str]]:
+    """페이지별 텍스트를 (page_number, line) 으로 하나씩 생성 (전체 목록을 만들지 않음)."""
     for page_num, text in pages:
         for line in text.splitlines():
-            all_lines.append((page_num, line))
+            yield page_num, line
+
 
+def parse_articles(pages: Iterable[tuple[int, str]]) -> list[dict]:
+    """
+    페이지별 텍스트를 받아 조문 단위 dict 리스트 반환.
+    각 dict: {article_number, article_title, article_text, page_number, headings}
+    - headings: 이 조문 바로 앞에 나온 편/장/절 제목 줄 목록 (조문 본문에서 제외)
+    조문 본문은 조각 리스트에 모았다가 조문이 끝날 때 한 번만 join 한다.
+    """
     articles: list[dict] = []
     current: dict | None = None
+    parts: list[str] = []
+    pending_headings: list[str] = []
 
-    for page_num, line in all_lines:
+    for page_num, line in _iter_lines(pages):
         stripped = line.strip()
         if not stripped:
             if current:
-                current["article_text"] += "\n"
+                parts.append("\n")
+            continue
+
+        # 편/장/절 제목: 조문 시작 전이거나 앞 조문의 문장이 끝난 뒤의 독립된 줄만 인정
+        # (줄바꿈된 본문 "제2장 제1절에 따른 인가를 받아야 하며" 가 제목으로 빠지지 않도록)
+        heading = None
+        if not TOC_PATTERN.search(stripped) and (current is None or _ends_sentence(parts)):
+            heading = parse_heading(stripped)
+        if heading:
+            pending_headings.append(heading[1])
             continue
 
         m = ARTICLE_PATTERN.match(stripped)
         if m:
             # 이전 조문 저장
             if current:
-                current["article_text"] = current["article_text"].strip()
+                current["article_text"] = "".join(parts).strip()
                 articles.append(current)
 
             raw_number = m.group(1)
@@ -74,32 +242,42 @@ def parse_articles(pages: list[tuple[int, str]]) -> list[dict]:
             current = {
                 "article_number": article_number,
                 "article_title": article_title,
-                "article_text": stripped + "\n",
+                "article_text": "",
                 "page_number": page_num,
+                "headings": pending_headings,
             }
-        else:
-            if current:
-                # 항/호/목 번호로 시작하면 단락 구분 (줄바꿈)
-                # 그 외 일반 연속 줄은 공백으로 연결 (PDF 레이아웃 행바꿈 제거)
-                if PARAGRAPH_START.match(stripped):
-                    current["article_text"] += "\n" + stripped
-                else:
-                    # 직전 텍스트가 하이픈으로 끝나면 (단어 분리) 하이픈 제거 후 연결
-                    if current["article_text"].endswith("-"):
-                        current["article_text"] = current["article_text"][:-1] + stripped
-                    else:
-                        current["article_text"] += " " + stripped
-            # 조문 시작 전 텍스트는 무시
+            parts = [stripped + "\n"]
+            pending_headings = []
+        elif current:
+            # 항/호/목 번호로 시작하면 단락 구분 (줄바꿈)
+            # 그 외 일반 연속 줄은 공백으로 연결 (PDF 레이아웃 행바꿈 제거)
+            if PARAGRAPH_START.match(stripped):
+                parts.append("\n" + stripped)
+            elif parts[-1].endswith("-"):
+                # 직전 텍스트가 하이픈으로 끝나면 (단어 분리) 하이픈 제거 후 연결
+                parts[-1] = parts[-1][:-1] + stripped
+            else:
+                parts.append(" " + stripped)
+        # 조문 시작 전 텍스트는 무시
 
     # 마지막 조문 저장
     if current:
-        current["article_text"] = current["article_text"].strip()
+        current["article_text"] = "".join(parts).strip()
         articles.append(current)
 
     # 목차 항목 제거: 점선 패턴이 있거나 본문이 극히 짧은 항목
     return [a for a in articles if not _is_toc_entry(a)]
 
 
+def _ends_sentence(parts: list[str]) -> bool:
+    """조문 본문 조각의 마지막 글자가 문장 끝인지 (빈 줄로 넣은 줄바꿈 조각은 건너뜀)."""
+    for part in reversed(parts):
+        text = part.rstrip()
+        if text:
+            return bool(SENTENCE_END.search(text))
+    return True
+
+
 def _is_toc_entry(article: dict) -> bool:
     """
     목차 항목 여부 판단.
@@ -121,9 +299,9 @@ def _is_toc_entry(article: dict) -> bool:
     return False
 
 
-def parse_pdf(pdf_file: IO[bytes]) -> list[dict]:
+def parse_pdf(pdf_file: IO[bytes], backend: str | None = None) -> list[dict]:
     """PDF 파일 객체 → 조문 리스트."""
-    pages = extract_text_by_page(pdf_file)
+    pages = extract_text_by_page(pdf_file, backend=backend)
     return parse_articles(pages)
 
 
@@ -138,15 +316,8 @@ _ENACTED_PATTERNS = [
 ]
 
 
-def extract_enacted_date(pdf_file: IO[bytes]) -> str | None:
-    """
-    PDF 전체 텍스트에서 시행일을 추출하여 'YYYY-MM-DD' 형식으로 반환.
-    부칙(附則) 근처를 우선 탐색하고, 없으면 전체 텍스트에서 탐색.
-    """
-    pdf_file.seek(0)
-    pages = extract_text_by_page(pdf_file)
-    full_text = "\n".join(text for _, text in pages)
-
+def _find_enacted_date(full_text: str) -> str | None:
+    """전체 텍스트에서 시행일을 찾아 'YYYY-MM-DD' 로 반환. 부칙 근처 우선."""
     # 부칙 섹션 우선 탐색
     addendum_match = re.search(r"부\s*칙", full_text)
     search_text = full_text[addendum_match.start():] if addendum_match else full_text
@@ -161,3 +332,87 @@ def extract_enacted_date(pdf_file: IO[bytes]) -> str | None:
             return f"{year}-{int(month):02d}-{int(day):02d}"
 
     return None
+
+
+def extract_enacted_date(pdf_file: IO[bytes]) -> str | None:
+    """
+    PDF 전체 텍스트에서 시행일을 추출하여 'YYYY-MM-DD' 형식으로 반환.
+    부칙(附則) 근처를 우선 탐색하고, 없으면 전체 텍스트에서 탐색.
+    조문 파싱도 필요하면 텍스트를 한 번만 추출하는 analyze_pdf 를 사용할 것.
+    """
+    pages = extract_text_by_page(pdf_file)
+    return _find_enacted_date("\n".join(text for _, text in pages))
+
+
+def _cache_key(pdf_data: bytes, backend: str) -> str:
+    digest = hashlib.sha256(pdf_data)
+    digest.update(f"\x00{PARSER_VERSION}\x00{backend}".encode())
+    return digest.hexdigest()
+
+
+def _cache_load(key: str) -> dict | None:
+    path = os.path.join(PARSE_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            result = json.load(f)
+        os.utime(path)  # 최근 사용 시각 갱신 (LRU 축출 기준)
+        return result
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(key: str, result: dict):
+    """결과 저장 후 캐시 전체 크기가 PARSE_CACHE_MAX_BYTES 를 넘으면 오래된 항목부터 삭제."""
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        path = os.path.join(PARSE_CACHE_DIR, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        entries = []
+        for name in os.listdir(PARSE_CACHE_DIR):
+            if name.endswith(".json"):
+                st = os.stat(os.path.join(PARSE_CACHE_DIR, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= PARSE_CACHE_MAX_BYTES:
+                break
+            os.remove(os.path.join(PARSE_CACHE_DIR, name))
+            total -= size
+    except OSError:
+        pass  # 캐시 실패는 업로드 결과에 영향 없음
+
+
+def analyze_pdf(
+    pdf_file: IO[bytes], backend: str | None = None, use_cache: bool = True,
+) -> dict:
+    """
+    PDF 텍스트를 한 번만 추출하여 조문·시행일·페이지 통계를 함께 반환.
+    동일 PDF(SHA-256) + 동일 파서 버전·백엔드의 결과는 디스크 캐시에서 즉시 반환.
+
+    Returns: {articles, enacted_date, page_count, empty_pages, char_count}
+    - empty_pages: 텍스트 레이어가 없는 페이지 수 (스캔본 판별용)
+    """
+    backend = backend or PDF_BACKEND
+    pdf_file.seek(0)
+    key = _cache_key(pdf_file.read(), backend) if use_cache else None
+    if key:
+        cached = _cache_load(key)
+        if cached is not None:
+            return cached
+
+    pages = extract_text_by_page(pdf_file, backend=backend)
+    full_text = "\n".join(text for _, text in pages)
+    result = {
+        "articles":     parse_articles(pages),
+        "enacted_date": _find_enacted_date(full_text),
+        "page_count":   len(pages),
+        "empty_pages":  sum(1 for _, text in pages if not text.strip()),
+        "char_count":   len(full_text),
+    }
+    if key:
+        _cache_store(key, result)
+    return result
@@ -1,10 +1,20 @@
 """
 키워드 검색 결과 처리 및 하이라이트 모듈.
 """
+import os
 import re
+import sys
 import html
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
-from db import search_articles
+from db import (
+    get_generation, search_articles_page, get_article_units, find_terms_by_initials, find_similar_terms,
+    find_documents_by_name, find_articles_by_key,
+)
+from structure import DOC_ALIASES, parse_article_ref, unit_citation
+from tokenizer import is_initials, normalize_term, term_phrase
 
 CATEGORIES = ["법령", "모범규준", "사규", "감독규정"]
 
@@ -17,10 +27,311 @@ CATEGORY_COLORS = {
 }
 
 
-def run_search(keyword: str, selected_categories: list[str]) -> list[dict]:
+# ── 조문 번호 바로가기 ──────────────────────────────────────────────────────
+
+def lookup_article_ref(keyword: str) -> dict | None:
+    """
+    검색어가 조문 인용("자본시장법 제9조의2 제1항")이면 해당 조문을 색인으로 바로 조회.
+    Returns: None (조문 인용이 아니거나 문서명을 찾지 못함)
+             또는 {"label": "제9조의2제1항", "has_unit": 항/호/목 지정 여부,
+                   "articles": [조문 row + "unit_start"]}
+    """
+    ref = parse_article_ref(keyword)
+    if ref is None:
+        return None
+    doc_ids = None
+    if ref["doc"]:
+        name = DOC_ALIASES.get(ref["doc"].replace(" ", ""), ref["doc"])
+        docs = find_documents_by_name(name)
+        if not docs:
+            return None
+        doc_ids = [d["id"] for d in docs]
+    articles = find_articles_by_key(ref["key"], doc_ids)
+    units_by_article = get_article_units([a["id"] for a in articles]) if ref["chain"] else {}
+    for a in articles:
+        a["unit_start"] = _find_unit_start(units_by_article.get(a["id"], []), ref["chain"])
+    return {
+        "label": unit_citation(ref["label"], ref["chain"]),
+        "has_unit": bool(ref["chain"]),
+        "articles": articles,
+    }
+
+
+def _find_unit_start(nodes: list[dict], chain: list[tuple[str, str]]) -> int | None:
+    """구조 노드에서 항/호/목 체인을 따라 내려가 마지막 단위의 시작 오프셋 반환 (없으면 None)."""
+    parent = next((n["id"] for n in nodes if n["kind"] == "조"), None)
+    found = None
+    for kind, label in chain:
+        found = next(
+            (n for n in nodes if n["parent_id"] == parent and n["kind"] == kind and n["label"] == label),
+            None,
+        )
+        if found is None:
+            return None
+        parent = found["id"]
+    return found["start_offset"] if found else None
+
+
+# ── 검색어 구문 ─────────────────────────────────────────────────────────────
+# 단어 나열 = AND, OR 또는 | = OR (AND 보다 먼저 묶임), -단어 / NOT 단어 = 제외,
+# "따옴표" = 구절(조사 제거 없이 붙은 순서대로), doc:문서명 / cat:분류 = 필터
+_QUERY_TOKEN = re.compile(r'(-?)(?:(doc|cat):)?(?:"([^"]*)"?|(\S+))')
+_OR_WORDS = {"OR", "|"}
+
+
+def parse_query(keyword: str) -> dict:
+    """
+    검색창 입력 → 검색 계획 dict.
+    - groups: [[term, ...], ...] 그룹 안은 OR, 그룹끼리는 AND
+    - excludes: [term, ...] 하나라도 포함되면 제외
+    - doc_filters / cat_filters: [(값, 제외 여부), ...] 문서명은 부분 일치, 분류는 일치
+    - highlight: 하이라이트할 긍정 검색어 목록
+    term = {"text": 검색어, "phrase": FTS5 phrase 또는 None(→ LIKE)}
+    """
+    plan = {"groups": [], "excludes": [], "doc_filters": [], "cat_filters": [], "highlight": []}
+    join_or = negate_next = False
+    for m in _QUERY_TOKEN.finditer(keyword):
+        minus, field, quoted, bare = m.groups()
+        if quoted is None and not field and not minus:
+            if bare in _OR_WORDS:
+                join_or = True
+                continue
+            if bare == "AND":
+                continue
+            if bare == "NOT":
+                negate_next = True
+                continue
+        negated = bool(minus) or negate_next
+        negate_next = False
+        value = quoted if quoted is not None else bare
+        if field:
+            if value.strip():
+                key = "doc_filters" if field == "doc" else "cat_filters"
+                plan[key].append((value.strip(), negated))
+            continue
+        text = " ".join(value.split()) if quoted is not None else normalize_term(value)
+        if not text:
+            continue
+        term = {"text": text, "phrase": term_phrase(text)}
+        if negated:
+            plan["excludes"].append(term)
+        elif join_or and plan["groups"]:
+            plan["groups"][-1].append(term)
+        else:
+            plan["groups"].append([term])
+        if not negated and text not in plan["highlight"]:
+            plan["highlight"].append(text)
+        join_or = False
+    return plan
+
+
+# ── 초성·오타 허용 모드 ──────────────────────────────────────────────────────
+SEARCH_MODES = {"exact": "일반", "fuzzy": "초성·오타 허용"}
+# 검색 단어 하나당 확장할 최대 용어 수
+FUZZY_MAX_TERMS = 8
+# 허용 편집 거리 (글자 단위)
+FUZZY_MAX_EDITS = 1
+
+
+def expand_fuzzy(plan: dict) -> dict:
+    """
+    검색 계획의 긍정 단어를 용어 사전으로 확장 (같은 OR 그룹에 추가).
+    - 초성 단어("ㅈㅂㅅㅈㅂ") → 초성이 그 접두어인 용어 (문서 빈도 상위)
+    - 사전에 없는 단어 → 편집 거리 FUZZY_MAX_EDITS 이하 용어
+    구절·사전에 이미 있는 단어는 그대로 둔다. 확장된 용어도 하이라이트 대상.
+    후보가 없는 초성 단어는 원래 단어로 남겨 그 AND 조건이 사라지지 않게 한다 (결과 없음).
+    """
+    for group in plan["groups"]:
+        for term in list(group):
+            text = term["text"]
+            if " " in text:
+                continue
+            if is_initials(text):
+                candidates = [t["term"] for t in find_terms_by_initials(text, FUZZY_MAX_TERMS)]
+                if not candidates:
+                    continue
+                group.remove(term)
+                if text in plan["highlight"]:
+                    plan["highlight"].remove(text)
+            else:
+                similar = find_similar_terms(text, FUZZY_MAX_EDITS, FUZZY_MAX_TERMS)
+                if any(t["distance"] == 0 for t in similar):
+                    continue
+                candidates = [t["term"] for t in similar]
+            for c in candidates:
+                # 다른 그룹에 이미 있는 용어라도 이 그룹의 OR 후보에는 넣어야 AND 의미가 유지됨
+                if not any(t["text"] == c for t in group):
+                    group.append({"text": c, "phrase": term_phrase(c)})
+                if c not in plan["highlight"]:
+                    plan["highlight"].append(c)
+    return plan
+
+
+# ── 검색 결과 캐시 ──────────────────────────────────────────────────────────
+# 프로세스 전역 LRU. 키 = (정규화 검색어, 분류, 페이지, 페이지 크기, 모드)
+# DB 세대 번호(db.get_generation)가 바뀌면(업로드·크롤링·삭제) 전체 무효화
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+_cache: OrderedDict = OrderedDict()        # key → (결과, 추정 바이트)
+_cache_lock = threading.Lock()
+_cache_state = {"generation": None, "bytes": 0}
+_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+
+def _result_size(result: tuple) -> int:
+    """캐시 항목 메모리 추정치 (행 dict 와 문자열 값 크기 합)."""
+    rows, _total, cat_counts = result
+    size = sys.getsizeof(rows) + sys.getsizeof(cat_counts)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values())
+    return size
+
+
+def _cache_sync_generation(generation: int):
+    """세대 번호가 바뀌었으면 결과 캐시와 하이라이트 용어 캐시를 비움 (_cache_lock 보유 상태에서 호출)."""
+    if _cache_state["generation"] != generation:
+        if _cache_state["generation"] is not None:
+            _cache_stats["invalidations"] += 1
+        _cache.clear()
+        _cache_state.update(generation=generation, bytes=0)
+        _highlight_terms.cache_clear()
+
+
+def search_cache_stats() -> dict:
+    """모니터링용 캐시 상태: hits, misses, evictions, invalidations, entries, bytes, generation."""
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_cache), **_cache_state}
+
+
+def run_search(
+    keyword: str, selected_categories: list[str], page: int = 0, per_page: int = 10,
+    mode: str = "exact",
+) -> tuple[list[dict], int, dict[str, int]]:
+    """
+    관련도 순 검색 결과 중 page 번째 페이지만 반환 (결과 캐시 경유).
+    keyword 는 parse_query 구문으로 해석 (AND/OR/NOT, "구절", doc:/cat: 필터).
+    mode="fuzzy" 이면 초성·오타 단어를 용어 사전으로 확장 (expand_fuzzy).
+    Returns: (page_rows, total, category_counts)
+    - page_rows: compact_result 경량 행 (본문 없음). 호출마다 새 dict (캐시 항목 보호)
+    """
+    key = (
+        " ".join(keyword.split()),
+        tuple(sorted(selected_categories or [])),
+        page, per_page, mode,
+    )
+    generation = get_generation()
+    with _cache_lock:
+        _cache_sync_generation(generation)
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+        else:
+            _cache_stats["misses"] += 1
+
+    if entry is None:
+        result = _run_search_uncached(keyword, selected_categories, page, per_page, mode)
+        size = _result_size(result)
+        with _cache_lock:
+            # 조회 중 다른 세션이 쓰기를 했으면 이전 세대 결과는 저장하지 않음
+            if _cache_state["generation"] == generation and size <= SEARCH_CACHE_MAX_BYTES:
+                if key not in _cache:
+                    _cache[key] = (result, size)
+                    _cache_state["bytes"] += size
+                while _cache_state["bytes"] > SEARCH_CACHE_MAX_BYTES:
+                    _, (_, evicted) = _cache.popitem(last=False)
+                    _cache_state["bytes"] -= evicted
+                    _cache_stats["evictions"] += 1
+    else:
+        result = entry[0]
+
+    rows, total, cat_counts = result
+    return [dict(r) for r in rows], total, dict(cat_counts)
+
+
+def _run_search_uncached(
+    keyword: str, selected_categories: list[str], page: int, per_page: int, mode: str,
+) -> tuple[list[dict], int, dict[str, int]]:
     cats = selected_categories if selected_categories else None
-    return search_articles(keyword, cats)
+    plan = parse_query(keyword)
+    if mode == "fuzzy":
+        expand_fuzzy(plan)
+    rows, total, cat_counts = search_articles_page(
+        plan, cats, limit=per_page, offset=page * per_page
+    )
+    # 행마다 첫 일치 구간을 한 번만 찾아 단위 위치·스니펫 계산에 함께 사용
+    pattern = keyword_pattern(keyword, mode)
+    spans = [match_spans(r.get("normalized_text") or "", pattern, first_only=True) for r in rows]
+    attach_matched_units(rows, [s[0][0] if s else -1 for s in spans])
+    return [compact_result(r, s) for r, s in zip(rows, spans)], total, cat_counts
+
 
+def attach_matched_units(rows: list[dict], match_positions: list[int]):
+    """
+    각 결과 행에 검색 단어가 처음 나오는 가장 안쪽 항/호/목 단위를 row["unit"] 으로 첨부.
+    match_positions: 행별 첫 일치 위치 (normalized_text 기준, 없으면 -1)
+    {"citation": "제5조제2항제1호", "start", "end"} — 단위가 없으면(항 없는 조문 등) None.
+    현재 페이지 행에 대해서만 구조 노드를 한 번에 조회.
+    """
+    units_by_article = get_article_units([r["id"] for r in rows])
+    for row, pos in zip(rows, match_positions):
+        row["unit"] = None
+        nodes = units_by_article.get(row["id"], [])
+        if pos < 0 or not nodes:
+            continue
+        by_id = {n["id"]: n for n in nodes}
+        inner = None
+        for n in nodes:
+            if n["kind"] != "조" and n["start_offset"] <= pos < n["end_offset"]:
+                inner = n  # start_offset 순이므로 마지막으로 포함하는 노드가 가장 안쪽
+        if inner is None:
+            continue
+        chain = []
+        node = inner
+        while node is not None and node["kind"] != "조":
+            chain.append((node["kind"], node["label"]))
+            node = by_id.get(node["parent_id"])
+        row["unit"] = {
+            "citation": unit_citation(row["article_number"], chain[::-1]),
+            "start": inner["start_offset"],
+            "end": inner["end_offset"],
+        }
+
+
+# ── 결과 행 (세션·캐시 보관용 경량 형태) ──────────────────────────────────
+# 카드 표시에 필요한 필드 + 미리 잘라 둔 스니펫만 보관 (조문 본문 제외)
+# 전체 본문은 보조 패널이 db.get_article_by_id 로 선택 시점에 조회
+RESULT_FIELDS = (
+    "id", "doc_id", "article_number", "article_title", "page_number",
+    "doc_name", "doc_category", "source_type", "enacted_date", "unit",
+)
+# 스니펫: 첫 일치 위치 앞 30자 ~ 뒤 100자 (일치 없으면 앞 130자) ≈ 카드 3줄 분량
+SNIPPET_BEFORE = 30
+SNIPPET_AFTER = 100
+SNIPPET_HEAD = 130
+
+
+def compact_result(row: dict, spans: list[tuple[int, int]]) -> dict:
+    """
+    검색 결과 행 → RESULT_FIELDS + "snippet".
+    spans: normalized_text 전체의 일치 구간 (match_spans). 키워드가 속한 항/호/목이 있으면 그 단위 안에서 자름.
+    """
+    text = row.get("normalized_text") or ""
+    unit = row.get("unit")
+    if unit:
+        text = text[unit["start"]:unit["end"]]
+        spans = _shift_spans(spans, unit["start"], unit["end"])
+    s, e = snippet_window(len(text), spans, SNIPPET_BEFORE, SNIPPET_AFTER, SNIPPET_HEAD)
+    compact = {k: row.get(k) for k in RESULT_FIELDS}
+    compact["snippet"] = (
+        ("…" if s > 0 else "") + text[s:e].replace("\n", " ") + ("…" if e < len(text) else "")
+    )
+    return compact
+
+
+# ── 하이라이트 ──────────────────────────────────────────────────────────────
+# 검색어별 긍정 검색어 → 트라이 정규식 1개로 컴파일(캐시)하여 본문을 한 번만 훑어 일치 구간(span) 목록을 만들고,
+# 스니펫 범위 계산과 <mark> 마크업을 모두 같은 구간 목록에서 생성한다.
 
 _MARK_STYLE = (
     'background:#a3e635;color:#14532d;'
@@ -28,23 +339,111 @@ _MARK_STYLE = (
 )
 
 
-def _apply_highlight(escaped_text: str, keyword: str) -> str:
-    """이미 html.escape 된 텍스트에 키워드 하이라이트 적용."""
+@lru_cache(maxsize=256)
+def _highlight_terms(keyword: str, mode: str) -> tuple[str, ...]:
+    """하이라이트할 긍정 검색어. fuzzy 모드는 용어 사전 확장 결과 포함 (카드마다 재조회하지 않도록 캐시)."""
+    plan = parse_query(keyword)
+    if mode == "fuzzy":
+        expand_fuzzy(plan)
+    return tuple(sorted({t.lower() for t in plan["highlight"] if t}))
+
+
+def _trie_regex(terms: tuple[str, ...]) -> str:
+    """
+    검색어 목록 → 공통 접두어를 묶은 트라이 정규식 ("투자자|투자자문|투자" → "투자(?:자(?:문)?)?").
+    각 위치에서 분기 하나만 따라가므로 검색어 수가 늘어도 한 번의 훑기로 끝나고 (Aho-Corasick 과 같은 효과),
+    탐욕적 (?:…)? 로 같은 위치에서는 가장 긴 검색어가 일치한다.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+@lru_cache(maxsize=256)
+def _compile_terms(terms: tuple[str, ...]) -> re.Pattern | None:
+    return re.compile(_trie_regex(terms), re.IGNORECASE) if terms else None
+
+
+def keyword_pattern(keyword: str, mode: str = "exact") -> re.Pattern | None:
+    """
+    검색어의 긍정 검색어(조사 제거 어간·구절)를 모두 찾는 정규식 (검색어별 1회 컴파일, 캐시).
+    긍정 검색어가 없으면(제외어·필터만 입력 등) None.
+    """
     if not keyword or not keyword.strip():
-        return escaped_text
-    pattern = re.compile(re.escape(html.escape(keyword)), re.IGNORECASE)
-    return pattern.sub(
-        lambda m: f'<mark style="{_MARK_STYLE}">{m.group()}</mark>',
-        escaped_text,
+        return None
+    return _compile_terms(_highlight_terms(keyword, mode))
+
+
+def match_spans(text: str, pattern: re.Pattern | None, first_only: bool = False) -> list[tuple[int, int]]:
+    """본문의 일치 구간 [(start, end), ...] — 한 번의 훑기. first_only 이면 첫 구간만 (스니펫·단위 위치용)."""
+    if pattern is None:
+        return []
+    if first_only:
+        m = pattern.search(text)
+        return [m.span()] if m else []
+    return [m.span() for m in pattern.finditer(text)]
+
+
+def _shift_spans(spans: list[tuple[int, int]], start: int, end: int) -> list[tuple[int, int]]:
+    """[start, end) 안의 일치 구간만 남기고 start 기준 오프셋으로 변환."""
+    return [(s - start, e - start) for s, e in spans if s >= start and e <= end]
+
+
+def snippet_window(
+    length: int, spans: list[tuple[int, int]], before: int, after: int, head: int,
+) -> tuple[int, int]:
+    """첫 일치 구간 앞 before ~ 뒤 after 글자 범위. 일치가 없으면 앞 head 글자."""
+    if not spans:
+        return 0, min(length, head)
+    s, e = spans[0]
+    return max(0, s - before), min(length, e + after)
+
+
+# 마크업 조립용 표식 (정규화 본문에 나오지 않는 제어 문자) — 한 번의 html.escape 뒤 <mark> 태그로 치환
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+
+def render_marked(text: str, spans: list[tuple[int, int]], start: int = 0, end: int | None = None) -> str:
+    """text[start:end] 를 html.escape 하고 그 안에 온전히 들어가는 일치 구간을 <mark> 로 감싼 HTML."""
+    end = len(text) if end is None else end
+    parts = []
+    pos = start
+    for s, e in spans:
+        if s < pos or e > end:
+            continue
+        parts += (text[pos:s], _MARK_OPEN, text[s:e], _MARK_CLOSE)
+        pos = e
+    parts.append(text[pos:end])
+    body = "".join(parts)
+    if _MARK_OPEN in text or _MARK_CLOSE in text:
+        # 표식 문자가 원문에 있으면 조각별로 escape (parts = [앞, 표식, 일치, 표식] 반복 + 끝)
+        tags = (None, f'<mark style="{_MARK_STYLE}">', None, "</mark>")
+        return "".join(tags[i % 4] or html.escape(p) for i, p in enumerate(parts))
+    return (
+        html.escape(body)
+        .replace(_MARK_OPEN, f'<mark style="{_MARK_STYLE}">')
+        .replace(_MARK_CLOSE, "</mark>")
     )
 
 
-def highlight_snippet(text: str, keyword: str) -> str:
+def highlight_snippet(text: str, keyword: str, mode: str = "exact") -> str:
     """
     평문 스니펫에서 키워드를 라임 그린으로 하이라이트 (HTML 반환).
     카드 미리보기 전용.
     """
-    return _apply_highlight(html.escape(text), keyword)
+    return render_marked(text, match_spans(text, keyword_pattern(keyword, mode)))
 
 
 def highlight_text(text: str, keyword: str, max_chars: int = 400) -> str:
@@ -52,67 +451,25 @@ def highlight_text(text: str, keyword: str, max_chars: int = 400) -> str:
     텍스트에서 키워드를 하이라이트(HTML <mark>)하여 반환.
     키워드 주변 max_chars 글자만 표시.
     """
-    if not keyword.strip():
-        escaped = html.escape(text[:max_chars])
-        return escaped + ("..." if len(text) > max_chars else "")
-
-    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-    match = pattern.search(text)
-
-    if match:
-        start = max(0, match.start() - 100)
-        end = min(len(text), match.end() + 300)
-        snippet = text[start:end]
+    spans = match_spans(text, keyword_pattern(keyword))
+    if spans:
+        start, end = snippet_window(len(text), spans, 100, 300, max_chars)
         prefix = "..." if start > 0 else ""
         suffix = "..." if end < len(text) else ""
     else:
-        snippet = text[:max_chars]
+        start, end = 0, min(len(text), max_chars)
         prefix = ""
         suffix = "..." if len(text) > max_chars else ""
-
-    return prefix + _apply_highlight(html.escape(snippet), keyword) + suffix
-
-
-_PARAGRAPH_START = re.compile(
-    r"^[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮]|^\d+\.\s|^[가나다라마바사아자차카타파하]\.\s"
-)
-
-
-def normalize_article_text(text: str) -> str:
-    """
-    조문 텍스트 정규화.
-    - PDF 레이아웃 행바꿈(의미 없는 줄바꿈)은 공백으로 연결
-    - 항/호/목 번호(①②③, 1. 2., 가. 나.) 앞 줄바꿈만 유지
-    - 연속 공백 제거
-    """
-    lines = text.splitlines()
-    result = ""
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            if result:
-                result += "\n"  # 빈 줄은 단락 구분으로 유지
-            continue
-        if not result:
-            result = stripped
-        elif _PARAGRAPH_START.match(stripped):
-            result += "\n" + stripped
-        else:
-            if result.endswith("-"):
-                result = result[:-1] + stripped   # 하이픈 단어 분리 복원
-            else:
-                result += " " + stripped
-    return re.sub(r"[ \t]{2,}", " ", result)
+    return prefix + render_marked(text, spans, start, end) + suffix
 
 
-def highlight_full_text(text: str, keyword: str) -> str:
+def highlight_full_text(normalized_text: str, keyword: str, mode: str = "exact") -> str:
     """
-    전체 텍스트에서 키워드를 모두 하이라이트. 의미 있는 줄바꿈만 보존.
-    문서 뷰어 전용 — 내용을 잘라내지 않음.
+    정규화된 전체 텍스트(articles.normalized_text)에서 키워드를 모두 하이라이트.
+    의미 있는 줄바꿈만 보존. 문서 뷰어 전용 — 내용을 잘라내지 않음.
     """
-    normalized = normalize_article_text(text)
-    escaped = _apply_highlight(html.escape(normalized), keyword)
-    return escaped.replace("\n", "<br>")
+    spans = match_spans(normalized_text, keyword_pattern(keyword, mode))
+    return render_marked(normalized_text, spans).replace("\n", "<br>")
 
 
 def category_badge(category: str) -> str:
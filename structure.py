@@ -0,0 +1,215 @@
+"""
+조문 계층 구조(편/장/절/조/항/호/목) 분석 모듈.
+- 편/장/절/관: 조문 사이에 오는 제목 줄 (parser / crawler 가 조문 dict 의 "headings" 로 전달)
+- 항/호/목: 정규화 텍스트(normalized_text) 안의 줄 단위 구간 (문자 오프셋)
+DB 에는 structure_nodes 테이블에 부모 포인터 형태로 저장된다.
+"""
+import re
+
+# 편/장/절/관 제목 줄: "제2장 금융투자업의 인가", "제 1 절 통칙", "제3장의2 …", "제1관 총칙"
+HEADING_PATTERN = re.compile(r"^제\s*(\d+)\s*(편|장|절|관)(?:의\s*(\d+))?(?:\s+(.*))?$")
+# 제목 끝의 개정 이력 표기: "<신설 2015. 7. 24.>", "<개정 2013. 5. 28., 2016. 3. 29.>" (여러 개 가능)
+_AMENDMENT_NOTES = re.compile(r"(?:\s*<[^<>]*>)+\s*$")
+# 제목 뒤에 바로 오는 인용 ("제1절에", "제3조의") → 제목이 아닌 본문
+_CITATION_START = re.compile(r"제\s*\d+\s*(?:편|장|절|관|조)")
+# 제목 줄로 인정할 최대 길이 (개정 이력 표기 제외, 본문 줄이 "제3장 및 ..." 으로 시작하는 경우 배제)
+HEADING_MAX_CHARS = 40
+
+# 항/호/목 시작: ①  /  1. 또는 1의2.  /  가.
+_UNIT_START = re.compile(
+    r"^(?:(?P<hang>[①-⑳])"
+    r"|(?P<ho>\d+(?:의\d+)?)\.\s"
+    r"|(?P<mok>[가나다라마바사아자차카타파하])\.\s)"
+)
+
+# 계층 깊이 (작을수록 상위)
+LEVELS = {"편": 0, "장": 1, "절": 2, "관": 3, "조": 4, "항": 5, "호": 6, "목": 7}
+
+
+def parse_heading(line: str) -> tuple[str, str] | None:
+    """
+    편/장/절/관 제목 줄이면 (kind, label) 반환, 아니면 None.
+    label 은 개정 이력 표기를 떼고 공백을 정리한 원문 (예: "제2장 금융투자업의 인가").
+    """
+    stripped = _AMENDMENT_NOTES.sub("", line.strip())
+    if len(stripped) > HEADING_MAX_CHARS:
+        return None
+    m = HEADING_PATTERN.match(stripped)
+    if not m:
+        return None
+    title = m.group(4) or ""
+    # 문장으로 끝나거나 다른 조문·장·절 인용으로 이어지면 본문 줄 ("제2장 제1절에 따른 …")
+    if title.endswith(("다.", "다", ",", "하며", "하고")) or _CITATION_START.match(title):
+        return None
+    return m.group(2), re.sub(r"\s+", " ", stripped)
+
+
+def split_units(text: str) -> list[dict]:
+    """
+    정규화된 조문 텍스트를 항/호/목 구간으로 분할.
+    각 dict: {kind, label, start, end, parent}
+    - start/end: text 안의 문자 오프셋 (end 는 다음 동급·상위 단위 직전 줄 끝)
+    - parent: 상위 단위의 리스트 인덱스 (조문 직속이면 None)
+    """
+    units: list[dict] = []
+    stack: list[int] = []
+    offset = 0
+    for line in text.split("\n"):
+        m = _UNIT_START.match(line)
+        if m:
+            kind = "항" if m.group("hang") else "호" if m.group("ho") else "목"
+            label = m.group("hang") or (m.group("ho") or m.group("mok")) + "."
+            while stack and LEVELS[units[stack[-1]]["kind"]] >= LEVELS[kind]:
+                units[stack.pop()]["end"] = offset - 1
+            units.append({
+                "kind": kind,
+                "label": label,
+                "start": offset,
+                "end": len(text),
+                "parent": stack[-1] if stack else None,
+            })
+            stack.append(len(units) - 1)
+        offset += len(line) + 1
+    return units
+
+
+def unit_citation(article_number: str, chain: list[tuple[str, str]]) -> str:
+    """
+    조문 번호 + 항/호/목 체인 → 인용 표기.
+    예: ("제5조", [("항", "②"), ("호", "1의2."), ("목", "가.")]) → "제5조제2항제1호의2가목"
+    """
+    number = article_number or ""
+    if number and not number.startswith("제"):
+        number = f"제{number}조"
+    parts = [number]
+    for kind, label in chain:
+        if kind == "항":
+            parts.append(f"제{ord(label) - 0x2460 + 1}항")
+        elif kind == "호":
+            number, _, branch = label.rstrip(".").partition("의")
+            parts.append(f"제{number}호" + (f"의{branch}" if branch else ""))
+        elif kind == "목":
+            parts.append(f"{label.rstrip('.')}목")
+    return "".join(parts)
+
+
+# ── 조문 번호 키 / 조문 인용 해석 ───────────────────────────────────────────
+
+_ARTICLE_NO = re.compile(r"^\s*제\s*(\d+)\s*조(?:\s*의\s*(\d+))?")
+_BARE_NO = re.compile(r"^\s*(\d+)(?:\s*의\s*(\d+))?\s*$")
+
+# "자본시장법 제9조의2 제1항 제3호 가목" — 문서명은 선택, 항/호/목은 선택
+_REF_PATTERN = re.compile(
+    r"^(?P<doc>.*?)\s*제\s*(?P<no>\d+)\s*조(?:\s*의\s*(?P<branch>\d+))?"
+    r"(?:\s*제?\s*(?P<hang>\d+)\s*항)?"
+    r"(?:\s*제?\s*(?P<ho>\d+)\s*호(?:\s*의\s*(?P<ho_branch>\d+))?)?"
+    r"(?:\s*(?P<mok>[가나다라마바사아자차카타파하])\s*목)?\s*$"
+)
+
+
+def article_key(article_number: str | None, article_text: str = "") -> str | None:
+    """
+    조문 번호 → 조회 키 ("제9조의2" → "9-2", "제9조" → "9").
+    크롤링 조문처럼 번호가 숫자만 있으면(가지번호 누락) 본문 첫머리 "제9조의2(...)" 로 보완.
+    """
+    m = _ARTICLE_NO.match(article_number or "") or _ARTICLE_NO.match(article_text)
+    if not m:
+        m = _BARE_NO.match(article_number or "")
+    if not m:
+        return None
+    return m.group(1) + (f"-{m.group(2)}" if m.group(2) else "")
+
+
+def parse_article_ref(text: str) -> dict | None:
+    """
+    검색어 전체가 조문 인용이면 해석 결과 반환, 아니면 None.
+    {"doc": 문서명(또는 약칭, 없으면 ""), "key": "9-2", "label": "제9조의2",
+     "chain": [("항", "①"), ("호", "3."), ("목", "가.")]}  — chain 은 structure_nodes label 형식
+    """
+    m = _REF_PATTERN.match(text.strip())
+    if not m:
+        return None
+    no, branch = m.group("no"), m.group("branch")
+    chain: list[tuple[str, str]] = []
+    if m.group("hang") and 1 <= int(m.group("hang")) <= 20:
+        chain.append(("항", chr(0x2460 + int(m.group("hang")) - 1)))
+    if m.group("ho"):
+        ho_branch = m.group("ho_branch")
+        chain.append(("호", m.group("ho") + (f"의{ho_branch}" if ho_branch else "") + "."))
+    if m.group("mok"):
+        chain.append(("목", m.group("mok") + "."))
+    return {
+        "doc": m.group("doc").strip(),
+        "key": no + (f"-{branch}" if branch else ""),
+        "label": f"제{no}조" + (f"의{branch}" if branch else ""),
+        "chain": chain,
+    }
+
+
+# ── 조문 간 참조 추출 ───────────────────────────────────────────────────────
+
+# 문서 약칭 → 정식 문서명 (공백 제거 후 비교). 검색창 조문 바로가기와 참조 해석에 공용.
+DOC_ALIASES = {
+    "자본시장법":       "자본시장과 금융투자업에 관한 법률",
+    "자통법":          "자본시장과 금융투자업에 관한 법률",
+    "자본시장법시행령":  "자본시장과 금융투자업에 관한 법률 시행령",
+    "자본시장법령":     "자본시장과 금융투자업에 관한 법률 시행령",
+    "금투업규정":       "금융투자업규정",
+    "금투규정":        "금융투자업규정",
+}
+# 감독규정 등 하위 규정에서 "법"/"영" 이 가리키는 기본 법령
+PARENT_ACT = "자본시장과 금융투자업에 관한 법률"
+_DECREE_SUFFIX = " 시행령"
+
+# 참조 앞의 문서 지시어: 「문서명」 / 같은 법·동법 / 이 법·이 영·이 규정 / 법 / 영·시행령
+_REF_CITE = re.compile(
+    r"(?:「(?P<named>[^」]+)」\s*|(?<![가-힣])(?P<prefix>같은\s*법|동법|이\s*(?:법|영|규정|규칙)|법|영|시행령)\s*)?"
+    r"제\s*(?P<no>\d+)\s*조(?:\s*의\s*(?P<branch>\d+))?"
+    r"(?P<unit>(?:\s*제\s*\d+\s*항)?(?:\s*제\s*\d+\s*호(?:\s*의\s*\d+)?)?)"
+)
+
+
+def _relative_doc(prefix: str, doc_name: str) -> str:
+    """법/영 지시어 → 현재 문서(doc_name) 기준 대상 문서명."""
+    if doc_name.endswith(_DECREE_SUFFIX):
+        act = doc_name[: -len(_DECREE_SUFFIX)]
+    elif doc_name.endswith(("법", "법률")):
+        act = doc_name
+    else:
+        act = PARENT_ACT
+    return act if prefix == "법" else act + _DECREE_SUFFIX
+
+
+def extract_references(text: str, doc_name: str, own_key: str | None = None) -> list[dict]:
+    """
+    조문 본문에서 다른 조문 인용을 추출.
+    - "제5조제1항에 따라" → 같은 문서, "법 제9조" → 상위 법률, "영 제3조" → 시행령,
+      "「문서명」 제2조" → 해당 문서, "같은 법 제4조" → 직전에 이름이 나온 문서
+    - 조문 머리의 자기 번호(own_key 와 같은 같은 문서 참조)는 제외
+    Returns: [{"doc_name", "key", "unit"}] (unit: "제1항제2호" 처럼 항/호 인용 표기, 없으면 "")
+    중복 제거, 출현 순서 유지.
+    """
+    refs: list[dict] = []
+    seen: set[tuple[str, str, str]] = set()
+    last_named = PARENT_ACT
+    for m in _REF_CITE.finditer(text):
+        prefix = re.sub(r"\s+", "", m.group("prefix") or "")
+        if m.group("named"):
+            name = m.group("named").strip()
+            target = DOC_ALIASES.get(name.replace(" ", ""), name)
+            last_named = target
+        elif prefix in ("같은법", "동법"):
+            target = last_named
+        elif prefix in ("법", "영", "시행령"):
+            target = _relative_doc("법" if prefix == "법" else "영", doc_name)
+            last_named = target
+        else:
+            target = doc_name
+        key = m.group("no") + (f"-{m.group('branch')}" if m.group("branch") else "")
+        if target == doc_name and key == own_key:
+            continue
+        unit = re.sub(r"\s+", "", m.group("unit"))
+        if (target, key, unit) not in seen:
+            seen.add((target, key, unit))
+            refs.append({"doc_name": target, "key": key, "unit": unit})
+    return refs
@@ -0,0 +1,45 @@
+"""parser.parse_articles 조문 경계·편/장/절 제목 인식, 항/호/목 구조 분할 검사."""
+from normalize import normalize_article_text
+from parser import parse_articles
+from structure import split_units
+
+PAGES = [(1, """제1장 총칙
+제5조(인가) ① 금융투자업을 영위하려는 자는 금융위원회로부터
+제2장 제1절에 따른 인가를 받아야 하며
+그 밖의 인가 요건과 절차에 관하여 필요한 사항은 대통령령으로 정한다.
+제2장 금융투자업
+제6조(등록)
+① 등록에 관한 사항은 대통령령으로 정하는 바에 따라 금융위원회가 심사하여 처리한다.
+② 금융위원회는 등록 신청을 받은 경우 그 내용을 검토하여
+제3장 공시 및 보고
+절차를 진행한다.
+""")]
+
+
+def test_headings_between_articles():
+    articles = parse_articles(PAGES)
+    assert [a["article_number"] for a in articles] == ["제5조", "제6조"]
+    assert articles[0]["headings"] == ["제1장 총칙"]
+    assert articles[1]["headings"] == ["제2장 금융투자업"]
+
+
+def test_wrapped_body_line_is_not_a_heading():
+    """본문 중간에 줄바꿈되어 "제N장 …" 으로 시작하는 줄은 조문 본문에 남아야 함."""
+    first, second = parse_articles(PAGES)
+    assert "제2장 제1절에 따른 인가를 받아야 하며" in first["article_text"]
+    assert "제3장 공시 및 보고 절차를 진행한다." in second["article_text"]
+
+
+def test_inserted_items_become_units():
+    """호의N(1의2.) 과 ⑯ 이후 항 번호도 줄 단위로 분리되어 구조 노드가 되어야 함."""
+    pages = [(1, """제7조(정의) 이 영에서 사용하는 용어의 뜻은 다음과 같다.
+1. "투자자"란 금융투자상품을 취득하는 자를 말한다.
+1의2. "전문투자자"란 위험감수능력이 있는 자를 말한다.
+2. "일반투자자"란 전문투자자가 아닌 자를 말한다.
+⑯ 그 밖에 필요한 사항은 금융위원회가 정한다.
+""")]
+    (article,) = parse_articles(pages)
+    text = normalize_article_text(article["article_text"])
+    assert [(u["kind"], u["label"]) for u in split_units(text)] == [
+        ("호", "1."), ("호", "1의2."), ("호", "2."), ("항", "⑯"),
+    ]
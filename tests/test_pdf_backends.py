@@ -0,0 +1,59 @@
+"""parse_articles 조문 경계가 PDF 추출 백엔드(PyMuPDF / pdfplumber)와 무관하게 같은지 검사."""
+import io
+
+import pytest
+
+import parser
+
+pymupdf = pytest.importorskip("pymupdf")
+
+# 생성할 예시 문서: 페이지별 줄 목록 (편/장 제목, 여러 줄 조문, 페이지를 넘는 조문 포함)
+PAGE_LINES = [
+    [
+        "제1장 총칙",
+        "제1조(목적) 이 법은 자본시장에서의 금융혁신과 공정한 경쟁을 촉진하고",
+        "투자자를 보호하며 금융투자업을 건전하게 육성함을 목적으로 한다.",
+        "제2조(정의) 이 법에서 사용하는 용어의 뜻은 다음과 같다.",
+        "1. 금융투자상품이란 이익을 얻거나 손실을 회피할 목적으로 하는 것을 말한다.",
+        "2. 투자자란 금융투자상품을 매매하거나 그 밖의 거래를 하는 자를 말한다.",
+    ],
+    [
+        "3. 전문투자자란 위험감수능력이 있는 투자자로서 대통령령으로 정하는 자를 말한다.",
+        "제2장 금융투자업의 인가",
+        "제3조의2(인가요건) ① 금융투자업인가를 받으려는 자는 다음 각 호의 요건을",
+        "모두 갖추어야 한다.",
+        "② 제1항에 따른 요건의 세부 사항은 대통령령으로 정한다.",
+        "제4조(인가의 신청) 인가를 받으려는 자는 인가신청서를 금융위원회에 제출하여야 한다.",
+        "금융위원회는 신청 내용을 심사하여 그 결과를 지체 없이 통지하여야 한다.",
+    ],
+]
+
+
+def _sample_pdf() -> bytes:
+    doc = pymupdf.open()
+    for lines in PAGE_LINES:
+        page = doc.new_page(width=595, height=842)
+        for i, line in enumerate(lines):
+            page.insert_text((40, 60 + i * 22), line, fontname="korea", fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _boundaries(backend: str) -> list[tuple]:
+    pages = parser.extract_text_by_page(io.BytesIO(_sample_pdf()), workers=1, backend=backend)
+    return [
+        (a["article_number"], a["article_title"], a["page_number"], a["headings"])
+        for a in parser.parse_articles(pages)
+    ]
+
+
+def test_backends_agree_on_article_boundaries():
+    expected = [
+        ("제1조", "목적", 1, ["제1장 총칙"]),
+        ("제2조", "정의", 1, []),
+        ("제3조의2", "인가요건", 2, ["제2장 금융투자업의 인가"]),
+        ("제4조", "인가의 신청", 2, []),
+    ]
+    assert _boundaries("pymupdf") == expected
+    assert _boundaries("pdfplumber") == expected
@@ -0,0 +1,65 @@
+"""검색 재현율 검사 (임시 DB): 숫자·한글이 섞인 검색어, 초성·오타 허용 모드."""
+import pytest
+
+import db
+import search
+
+ARTICLES = [
+    {"article_number": "제3조", "article_title": "적용", "page_number": 1,
+     "article_text": "제3조(적용) 제1조에 따른 목적을 달성하기 위하여 필요한 사항을 정한다."},
+    {"article_number": "제4조", "article_title": "준용", "page_number": 1,
+     "article_text": "제4조(준용) 법 제2조제1항의 금융투자상품에 관하여는 이 영을 준용한다."},
+    {"article_number": "제5조", "article_title": "기한", "page_number": 1,
+     "article_text": "제5조(기한) 보고서는 사유 발생일부터 30일까지 제출하여야 한다."},
+    {"article_number": "제6조", "article_title": "정의", "page_number": 2,
+     "article_text": "제6조(정의) 전문투자자란 위험감수능력이 있는 자를 말한다."},
+    {"article_number": "제7조", "article_title": "보호", "page_number": 2,
+     "article_text": "제7조(보호) 금융투자업자는 투자자를 보호하여야 한다."},
+]
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "regulations.db"))
+    db.init_db()
+    db.ingest_document("테스트법 시행령", "법령", "", ARTICLES)
+
+
+def _found(keyword: str, mode: str = "exact") -> list[str]:
+    rows, _, _ = search.run_search(keyword, [], 0, 10, mode)
+    return sorted(r["article_number"] for r in rows)
+
+
+@pytest.mark.parametrize("keyword, expected", [
+    ("제1조", ["제3조"]),        # 본문 "제1조에"
+    ("제2조", ["제4조"]),        # 본문 "제2조제1항"
+    ("30일", ["제5조"]),         # 본문 "30일까지"
+    ("발생일부터 30일", ["제5조"]),
+])
+def test_mixed_digit_hangul_terms(keyword, expected):
+    assert _found(keyword) == expected
+
+
+@pytest.mark.parametrize("keyword", ["ㅌㅈㅈ ㅌㅈㅈ", "ㅌㅈㅈ OR ㅌㅈㅈ", 'ㅌㅈㅈ "ㅌㅈㅈ"'])
+def test_fuzzy_repeated_initials(keyword):
+    assert _found(keyword, "fuzzy") == ["제6조", "제7조"]
+
+
+def test_fuzzy_candidate_shared_with_other_group():
+    """초성 확장 후보(투자자)가 다른 AND 그룹의 단어와 같아도 그 그룹의 후보로 남아야 함."""
+    assert _found("투자자", "fuzzy") == ["제6조", "제7조"]
+    assert _found("투자자 ㅌㅈㅈ", "fuzzy") == ["제6조", "제7조"]
+
+
+def test_fuzzy_initials_without_candidates_keeps_and():
+    """사전에 후보가 없는 초성 단어는 AND 조건으로 남아 결과가 없어야 함 (검색 범위가 넓어지지 않음)."""
+    assert _found("투자자 ㅎㅎㅎ", "fuzzy") == []
+
+
+def test_unchanged_reingest_keeps_cache_generation():
+    """내용이 같은 재수집은 세대 번호를 올리지 않아 검색 캐시가 유지되어야 함."""
+    generation = db.get_generation()
+    db.ingest_document("테스트법 시행령", "법령", "", ARTICLES)
+    assert db.get_generation() == generation
+    db.ingest_document("테스트법 시행령", "법령", "", ARTICLES[:-1])
+    assert db.get_generation() == generation + 1
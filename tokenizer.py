@@ -0,0 +1,140 @@
+"""
+한국어 검색 토크나이저 모듈.
+- 색인: 조문 원문(article_text)을 글자 bigram 토큰열로 변환 (db 의 articles_kidx 인덱스 트리거가 호출)
+        (FTS5 unicode61 토크나이저가 공백 기준으로 다시 나눔)
+- 질의: 어절 끝 조사를 떼어낸 어간을 같은 규칙으로 bigram 화하여 FTS5 phrase 로 변환
+        (AND/OR/NOT·필터 구문 해석은 search.parse_query)
+색인은 원문 어절 그대로 만들고 조사 제거는 질의에만 적용한다.
+→ "투자자에게" 로 검색해도 "투자자의", "투자자는" 이 포함된 조문이 모두 검색됨.
+토큰화 규칙이 바뀌면 TOKENIZER_VERSION 을 올릴 것 (init_db 가 색인을 다시 만듦).
+"""
+import re
+
+TOKENIZER_VERSION = "1"
+
+# 한글 음절 연속 / 영문·숫자 연속 구간
+_RUN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z0-9]+")
+
+# 단어 앞뒤의 기호 (따옴표·괄호 등)
+_EDGE_PUNCT = re.compile(r"^[^가-힣ㄱ-ㅎA-Za-z0-9]+|[^가-힣ㄱ-ㅎA-Za-z0-9]+$")
+
+# 어절 끝 조사 (긴 것부터 검사)
+PARTICLES = sorted(
+    [
+        "에게서", "으로서", "으로써", "에서는", "에서의", "에게는", "으로는", "에서도",
+        "에게", "에서", "으로", "까지", "부터", "보다", "처럼", "만큼", "이나", "이라",
+        "에는", "에도", "와의", "과의", "로서", "로써",
+        "의", "을", "를", "은", "는", "이", "가", "와", "과", "에", "로", "도", "만",
+    ],
+    key=len,
+    reverse=True,
+)
+# 조사 제거 후 어간 최소 길이 (“국가” → “국” 처럼 과도하게 잘리는 것 방지)
+STEM_MIN_CHARS = 2
+
+
+def _run_tokens(run: str) -> list[str]:
+    """한 구간의 색인 토큰. 한글은 글자 bigram (1글자는 그대로), 영문·숫자는 소문자 단어."""
+    if not ("가" <= run[0] <= "힣"):
+        return [run.lower()]
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def index_grams(text: str) -> str:
+    """색인용 토큰열 (공백 구분). SQL 함수 index_grams() 로 등록되어 인덱스 트리거에서 호출된다."""
+    tokens: list[str] = []
+    for run in _RUN_PATTERN.findall(text):
+        tokens.extend(_run_tokens(run))
+    return " ".join(tokens)
+
+
+def strip_particle(word: str) -> str:
+    """어절 끝 조사 하나를 제거한 어간. 제거 후 STEM_MIN_CHARS 미만이면 원형 유지."""
+    for p in PARTICLES:
+        if word.endswith(p) and len(word) - len(p) >= STEM_MIN_CHARS:
+            return word[: -len(p)]
+    return word
+
+
+def normalize_term(word: str) -> str:
+    """검색 단어 하나 → 앞뒤 기호를 떼고 끝 조사를 제거한 검색어 (빈 문자열이면 검색 불가)."""
+    term = _EDGE_PUNCT.sub("", word)
+    if term and "가" <= term[-1] <= "힣":
+        term = strip_particle(term)
+    return term
+
+
+def term_phrase(text: str) -> str | None:
+    """
+    검색 단어(또는 따옴표 구절) → FTS5 phrase 문자열.
+    - 영문·숫자로 끝나면 마지막 토큰 접두어 검색 ("var" → "var" *)
+    - 1글자 한글 구간이 있으면 None (호출 측에서 LIKE 로 대체)
+      색인에서는 그 글자가 앞뒤 한글과 이어진 bigram 으로 들어가므로 ("제1조에" → 제 1 조에,
+      "제2조제1항" → … 조제 …, "30일까지" → 30 일까 까지) 단독 토큰으로는 찾을 수 없음
+    """
+    if any(len(run) == 1 and "가" <= run <= "힣" for run in _RUN_PATTERN.findall(text)):
+        return None
+    grams = index_grams(text)
+    if not grams:
+        return None
+    phrase = '"' + grams + '"'
+    if not ("가" <= grams[-1] <= "힣"):
+        phrase += " *"
+    return phrase
+
+
+# ── 용어 사전 (초성·오타 허용 검색용) ──────────────────────────────────────
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_RUN = re.compile(r"[가-힣]{2,}")
+_INITIALS_WORD = re.compile(r"^[ㄱ-ㅎ]{2,}$")
+# 사전에 넣을 용어 최대 길이 (긴 어절은 대부분 복합 서술어라 검색 가치가 낮음)
+TERM_MAX_CHARS = 12
+
+
+def initials(text: str) -> str:
+    """한글 음절 → 초성 문자열 ("자본비율" → "ㅈㅂㅂㅇ"). 한글이 아닌 글자는 그대로."""
+    return "".join(
+        _CHOSEONG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch
+        for ch in text
+    )
+
+
+def is_initials(word: str) -> bool:
+    """초성만으로 된 검색 단어인지 ("ㅈㅂㅅㅈㅂ")."""
+    return bool(_INITIALS_WORD.match(word))
+
+
+def extract_terms(text: str) -> dict[str, int]:
+    """조문 텍스트 → {용어: 출현 횟수}. 2글자 이상 한글 어절에서 끝 조사를 뗀 어간."""
+    counts: dict[str, int] = {}
+    for run in _HANGUL_RUN.findall(text):
+        term = strip_particle(run)
+        if len(term) <= TERM_MAX_CHARS:
+            counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def deletion_variants(term: str) -> set[str]:
+    """
+    한 글자씩 지운 변형 집합 (오타 허용 검색 색인 키).
+    두 단어의 변형 집합(자기 자신 포함)이 겹치면 편집 거리 2 이하 → edit_distance 로 확정.
+    """
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """글자 단위 편집 거리. limit 를 넘으면 계산을 멈추고 limit + 1 반환."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        for j, cb in enumerate(b, start=1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev[-1], limit + 1)
@@ -1,25 +1,57 @@
 """
 전체 조문 뷰어 — 새 탭에서 열리는 독립 뷰어.
-- 문서의 모든 조문을 순서대로 표시
+- 대상 조문 앞뒤 VIEWER_WINDOW 개 조문만 먼저 표시하고, 앞/뒤 조문은 버튼으로 구간 단위 추가 로드
+  (문서 전체를 한 번에 그리지 않으므로 시행령처럼 조문이 많은 문서도 즉시 표시됨)
 - 검색 키워드가 있는 조문에만 노란 배경 + 키워드 강조
-- 페이지 로드 후 해당 조문이 화면 중앙에 오도록 자동 스크롤
+- 페이지 로드 후 해당 조문(또는 항/호/목)이 화면 중앙에 오도록 자동 스크롤
+- 편/장/절 제목은 구조 색인(structure_nodes)에서 읽어 조문 사이에 표시
 """
 import html as html_lib
+import os
 
 import streamlit as st
 import streamlit.components.v1 as components
 
-from db import get_document_by_id, get_articles_by_doc_id
+from db import get_document_map, get_article_position, get_article_window
 from search import category_badge, highlight_full_text
 
+# 대상 조문 앞뒤로 처음 표시할 조문 수 = 앞/뒤 "더 보기" 한 번에 추가로 불러올 조문 수
+VIEWER_WINDOW = int(os.getenv("VIEWER_WINDOW", "20"))
 
-def render(doc_id: int, target_article_id: int, keyword: str = ""):
-    doc = get_document_by_id(doc_id)
+
+def render(
+    doc_id: int, target_article_id: int, keyword: str = "", target_unit: int | None = None,
+    mode: str = "exact",
+):
+    """
+    target_unit: 대상 조문 normalized_text 안의 항/호/목 시작 오프셋 (검색 결과 row["unit"]["start"]).
+    mode: 검색 모드 — 초성·오타 허용 모드면 확장된 용어까지 하이라이트.
+    """
+    doc = get_document_map().get(doc_id)
     if not doc:
         st.error("문서를 찾을 수 없습니다.")
         return
+    total = doc["article_count"] or 0
+
+    # ── 표시 구간 (seq 범위) — 링크(문서·조문)마다 세션에 보관 ─────────────
+    state_key = f"_viewer_window_{doc_id}_{target_article_id}"
+    window = st.session_state.get(state_key)
+    if window is None:
+        pos = get_article_position(target_article_id)
+        found = pos is not None and pos["doc_id"] == doc_id
+        center = pos["seq"] if found else 1
+        anchor = f"art-{target_article_id}" + (f"-u{target_unit}" if target_unit is not None else "")
+        window = {
+            "lo": max(1, center - VIEWER_WINDOW),
+            "hi": center + VIEWER_WINDOW,
+            "scroll": (anchor, "center") if found else None,   # (앵커 id, scrollIntoView block)
+        }
+        st.session_state[state_key] = window
 
-    articles = get_articles_by_doc_id(doc_id)
+    articles, headings = get_article_window(doc_id, window["lo"], window["hi"])
+    headings_by_seq: dict[int, list[dict]] = {}
+    for node in headings:
+        headings_by_seq.setdefault(node["seq"], []).append(node)
 
     # ── 헤더 ──────────────────────────────────────────────────────────────
     badge = category_badge(doc["doc_category"])
@@ -30,22 +62,46 @@ def render(doc_id: int, target_article_id: int, keyword: str = ""):
         unsafe_allow_html=True,
     )
     kw_label = f" · 검색어: **{keyword}**" if keyword else ""
-    st.caption(f"총 {len(articles)}개 조문{kw_label}")
+    shown = f" 중 {window['lo']}–{min(window['hi'], total)}번째 표시" if articles else ""
+    st.caption(f"총 {total}개 조문{shown}{kw_label}")
     st.divider()
 
-    # ── 조문 렌더링 ────────────────────────────────────────────────────────
+    # ── 조문 렌더링 (현재 구간만) ──────────────────────────────────────────
+    if window["lo"] > 1:
+        if st.button(f"▲ 앞 조문 {min(VIEWER_WINDOW, window['lo'] - 1)}개 더 보기",
+                     key=f"{state_key}_prev", use_container_width=True):
+            # 새로 붙는 조문 위로 화면이 밀리지 않도록 기존 첫 조문 위치로 다시 스크롤
+            window["scroll"] = (f"art-{articles[0]['id']}", "start") if articles else None
+            window["lo"] = max(1, window["lo"] - VIEWER_WINDOW)
+            st.rerun()
+
     for article in articles:
-        _render_article(article, target_article_id, keyword)
+        for node in headings_by_seq.get(article["seq"], []):
+            _render_heading(node)
+        _render_article(article, target_article_id, keyword, target_unit, mode)
+
+    if window["hi"] < total:
+        if st.button(f"▼ 뒤 조문 {min(VIEWER_WINDOW, total - window['hi'])}개 더 보기",
+                     key=f"{state_key}_next", use_container_width=True):
+            window["scroll"] = None
+            window["hi"] = min(total, window["hi"] + VIEWER_WINDOW)
+            st.rerun()
 
-    # ── 자동 스크롤: 대상 조문을 화면 중앙으로 ────────────────────────────
+    # ── 자동 스크롤: 대상 조문(항/호/목) 또는 앞 구간 로드 직전 위치로 (1회) ──
+    scroll = window.pop("scroll", None)
+    if scroll:
+        _scroll_to(*scroll)
+
+
+def _scroll_to(anchor: str, block: str):
     components.html(
         f"""
         <script>
         (function() {{
             function scrollToTarget() {{
-                var el = window.parent.document.getElementById('art-{target_article_id}');
+                var el = window.parent.document.getElementById('{anchor}');
                 if (el) {{
-                    el.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
+                    el.scrollIntoView({{ behavior: 'smooth', block: '{block}' }});
                 }} else {{
                     setTimeout(scrollToTarget, 150);
                 }}
@@ -59,7 +115,26 @@ def render(doc_id: int, target_article_id: int, keyword: str = ""):
     )
 
 
-def _render_article(article: dict, target_article_id: int, keyword: str):
+_HEADING_STYLE = {
+    "편": "font-size:1.05rem;margin:22px 0 10px;",
+    "장": "font-size:0.98rem;margin:18px 0 8px;",
+    "절": "font-size:0.9rem;margin:12px 0 6px;padding-left:10px;",
+    "관": "font-size:0.86rem;margin:10px 0 6px;padding-left:20px;",
+}
+
+
+def _render_heading(node: dict):
+    st.markdown(
+        f'<div style="font-weight:700;color:#14532d;{_HEADING_STYLE.get(node["kind"], "")}">'
+        f'{html_lib.escape(node["label"])}</div>',
+        unsafe_allow_html=True,
+    )
+
+
+def _render_article(
+    article: dict, target_article_id: int, keyword: str, target_unit: int | None = None,
+    mode: str = "exact",
+):
     is_target = article["id"] == target_article_id
 
     art_num   = html_lib.escape(article["article_number"] or "")
@@ -67,8 +142,17 @@ def _render_article(article: dict, target_article_id: int, keyword: str):
     title_str = f" ({art_title})" if art_title else ""
 
     # 본문 HTML
-    if is_target and keyword:
-        body_html = highlight_full_text(article["article_text"], keyword)
+    if is_target and target_unit is not None:
+        # 항/호/목 단위 앵커: 대상 단위 앞뒤를 잘라 id 가 있는 span 으로 감쌈
+        text = article["normalized_text"]
+        head, rest = text[:target_unit], text[target_unit:]
+        body_html = (
+            highlight_full_text(head, keyword, mode)
+            + f'<span id="art-{article["id"]}-u{target_unit}"></span>'
+            + highlight_full_text(rest, keyword, mode)
+        )
+    elif is_target and keyword:
+        body_html = highlight_full_text(article["normalized_text"], keyword, mode)
     else:
         body_html = html_lib.escape(article["article_text"]).replace("\n", "<br>")
 
@@ -2,12 +2,10 @@ import io
 
 import streamlit as st
 
-from db import (
-    upsert_document, insert_articles, update_article_count,
-    get_all_documents, delete_document,
-)
-from parser import parse_pdf, extract_enacted_date
-from crawler import MANAGED_LAWS, crawl_single_law
+from db import ingest_document, get_all_documents, delete_document
+from parser import analyze_pdf
+from crawler import MANAGED_LAWS, crawl_laws
+from search import search_cache_stats
 
 # 업로드 가능 분류: 법령·감독규정은 크롤링으로만 등록
 UPLOAD_CATEGORIES = ["모범규준", "사규"]
@@ -78,24 +76,28 @@ def render():
                     try:
                         # 메모리에서만 처리 — 디스크 저장 없음
                         pdf_bytes = io.BytesIO(uploaded_file.read())
-                        articles = parse_pdf(pdf_bytes)
-                        enacted_date = extract_enacted_date(pdf_bytes)
+                        analysis = analyze_pdf(pdf_bytes)
+                        articles = analysis["articles"]
+                        enacted_date = analysis["enacted_date"]
                     except ValueError as e:
                         st.error(f"파싱 오류: {e}")
                         st.stop()
 
                 if not articles:
+                    empty_note = (
+                        f" (텍스트 없는 페이지 {analysis['empty_pages']}/{analysis['page_count']})"
+                        if analysis["empty_pages"] else ""
+                    )
                     st.warning(
                         "조문을 인식하지 못했습니다. "
                         "텍스트 레이어가 없거나 '제X조' 형식의 조문이 없는 PDF일 수 있습니다."
+                        + empty_note
                     )
                 else:
-                    doc_id = upsert_document(
-                        doc_name.strip(), doc_category, "",
+                    ingest_document(
+                        doc_name.strip(), doc_category, "", articles,
                         enacted_date, source_type="pdf",
                     )
-                    insert_articles(doc_id, articles)
-                    update_article_count(doc_id, len(articles))
                     st.success(
                         f'"{doc_name}" 업로드 완료 — {len(articles)}개 조문 인식'
                         f'{"  (시행일: " + enacted_date + ")" if enacted_date else ""}'
@@ -239,15 +241,25 @@ def render():
                         st.session_state.pop("confirm_del_name", None)
                         st.rerun()
 
+    # ── 검색 캐시 상태 (모니터링) ───────────────────────────────────────────
+    stats = search_cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "-"
+    st.caption(
+        f"검색 캐시 — 적중 {stats['hits']} / 미적중 {stats['misses']} (적중률 {hit_rate}) · "
+        f"항목 {stats['entries']}개 · {stats['bytes'] / 1024:.0f}KB · "
+        f"제거 {stats['evictions']} · 무효화 {stats['invalidations']} · 세대 {stats['generation']}"
+    )
+
 
 def _run_crawler_update(laws: list[dict]):
-    """법령 목록을 순서대로 크롤링하여 DB에 저장."""
-    progress = st.progress(0, text="업데이트 준비 중...")
-    results = []
-    for i, law in enumerate(laws):
-        progress.progress(i / len(laws), text=f"수신 중: {law['name']}")
-        success, msg = crawl_single_law(law)
-        results.append((success, msg))
+    """법령 목록을 동시에 수신하고 DB에는 순차 저장."""
+    progress = st.progress(0, text=f"수신 중: {len(laws)}개 법령")
+
+    def on_progress(done: int, total: int, law_name: str):
+        progress.progress(done / total, text=f"저장 완료: {law_name} ({done}/{total})")
+
+    results = crawl_laws(laws, on_progress=on_progress)
     progress.progress(1.0, text="완료")
     for success, msg in results:
         if success:
@@ -3,7 +3,10 @@ import urllib.parse
 
 import streamlit as st
 
-from search import run_search, highlight_full_text, highlight_snippet, normalize_article_text, category_badge, CATEGORIES
+from search import (
+    run_search, highlight_full_text, highlight_snippet, category_badge,
+    lookup_article_ref, CATEGORIES, SEARCH_MODES,
+)
 
 
 def render():
@@ -27,7 +30,9 @@ def render():
         keyword = st.text_input(
             "검색어",
             label_visibility="collapsed",
-            placeholder="검색어 입력 (예: 순자본비율, 위험액, VaR)",
+            placeholder='검색어 입력 (예: 순자본비율, 위험액 OR VaR, "설명의무" -파생 doc:금융투자업규정)',
+            help='단어 나열 = 모두 포함 · OR = 하나 이상 · -단어 = 제외 · "구절" = 붙은 그대로 · '
+                 'doc:문서명 / cat:분류 = 필터',
             key="search_keyword",
         )
     with col_btn:
@@ -63,6 +68,16 @@ def render():
             if st.checkbox(cat, value=True, key=f"filter_{cat}"):
                 selected_categories.append(cat)
 
+    # ── 검색 모드 (초성·오타 허용) ──────────────────────────────────────────
+    mode = st.radio(
+        "검색 모드",
+        options=list(SEARCH_MODES),
+        format_func=SEARCH_MODES.get,
+        horizontal=True,
+        key="_search_mode",
+        label_visibility="collapsed",
+    )
+
     st.divider()
 
     # ── 검색 실행 ────────────────────────────────────────────────────────────
@@ -75,40 +90,63 @@ def render():
         st.session_state["_search_history"] = hist[:6]
 
         st.session_state["_last_keyword"] = keyword
-        st.session_state["_results"] = run_search(keyword, selected_categories)
         st.session_state["_page"] = 0
     elif not keyword:
-        st.session_state.pop("_results", None)
         st.session_state.pop("_last_keyword", None)
         st.session_state["_page"] = 0
 
-    results = st.session_state.get("_results")
-
-    if results is None:
+    if "_last_keyword" not in st.session_state:
         st.markdown(
             '<p style="color:#999;font-size:0.88rem;">검색어를 입력하고 검색 버튼을 누르세요.</p>',
             unsafe_allow_html=True,
         )
         return
 
-    if not results:
+    # ── 조문 번호 바로가기 ("자본시장법 제9조의2") ─────────────────────────
+    ref = lookup_article_ref(keyword)
+    if ref and ref["articles"]:
+        _render_article_jump(ref)
+        return
+
+    # 현재 페이지만 DB에서 조회 (전체 결과는 세션에 보관하지 않음)
+    per_page     = st.session_state.get("per_page", 10)
+    current_page = st.session_state.get("_page", 0)
+    page_results, total, cat_counts = run_search(
+        keyword, selected_categories, current_page, per_page, mode
+    )
+    total_pages = max(1, (total + per_page - 1) // per_page)
+    if current_page > total_pages - 1:
+        # 필터 변경 등으로 결과가 줄어든 경우 마지막 페이지로 보정
+        current_page = total_pages - 1
+        st.session_state["_page"] = current_page
+        page_results, total, cat_counts = run_search(
+            keyword, selected_categories, current_page, per_page, mode
+        )
+
+    if not total:
         st.markdown(
             f'<p style="color:#666;font-size:0.88rem;">'
             f'<b>"{keyword}"</b> 에 해당하는 조문을 찾을 수 없습니다.</p>',
             unsafe_allow_html=True,
         )
+        if mode == "exact":
+            st.caption("초성(예: ㅈㅂㅅㅈㅂ)이나 오타가 있다면 '초성·오타 허용' 모드로 검색해 보세요.")
         return
 
     # ── 페이지당 결과 수 선택 ────────────────────────────────────────────────
+    cat_summary = " · ".join(
+        f"{html.escape(cat)} {cat_counts[cat]}" for cat in CATEGORIES if cat_counts.get(cat)
+    )
     col_info, col_per_page = st.columns([4, 1])
     with col_info:
         st.markdown(
-            f'<span style="font-size:0.88rem;color:#555;">검색 결과 <b>{len(results)}건</b>'
-            f' &mdash; &ldquo;{html.escape(keyword)}&rdquo;</span>',
+            f'<span style="font-size:0.88rem;color:#555;">검색 결과 <b>{total}건</b>'
+            f' &mdash; &ldquo;{html.escape(keyword)}&rdquo;</span>'
+            f'<span style="font-size:0.75rem;color:#999;margin-left:8px;">{cat_summary}</span>',
             unsafe_allow_html=True,
         )
     with col_per_page:
-        per_page = st.selectbox(
+        st.selectbox(
             "페이지당 결과",
             options=[10, 30, 50, 100],
             index=0,
@@ -116,18 +154,12 @@ def render():
             label_visibility="collapsed",
         )
 
-    # ── 페이지네이션 계산 ────────────────────────────────────────────────────
-    total        = len(results)
-    total_pages  = max(1, (total + per_page - 1) // per_page)
-    current_page = min(st.session_state.get("_page", 0), total_pages - 1)
-
-    start        = current_page * per_page
-    end          = min(start + per_page, total)
-    page_results = results[start:end]
+    start = current_page * per_page
+    end   = start + len(page_results)
 
     st.markdown("")
     for row in page_results:
-        _render_article_card(row, keyword)
+        _render_article_card(row)
 
     # ── 페이지 이동 버튼 ─────────────────────────────────────────────────────
     if total_pages > 1:
@@ -151,12 +183,11 @@ def render():
                 st.rerun()
 
 
-def _render_article_card(row: dict, keyword: str):
+def _render_article_card(row: dict):
     article_number = row["article_number"] or ""
     article_title  = row["article_title"] or ""
     doc_name       = row["doc_name"]
     doc_category   = row["doc_category"]
-    article_text   = row["article_text"]
     source_type    = row.get("source_type", "pdf")
     enacted_date   = row.get("enacted_date") or ""
 
@@ -164,30 +195,51 @@ def _render_article_card(row: dict, keyword: str):
     src_label = "크롤링" if source_type == "crawler" else "PDF"
     date_part = f"  ·  시행 {enacted_date}" if enacted_date else ""
 
-    # 정규화 + 3줄 분량 스니펫
-    text = normalize_article_text(article_text).replace("\n", " ")
-    if keyword:
-        idx = text.lower().find(keyword.lower())
-        if idx >= 0:
-            s = max(0, idx - 30)
-            e = min(len(text), idx + len(keyword) + 100)
-            snippet = ("…" if s > 0 else "") + text[s:e] + ("…" if e < len(text) else "")
-        else:
-            snippet = text[:130] + ("…" if len(text) > 130 else "")
-    else:
-        snippet = text[:130] + ("…" if len(text) > 130 else "")
+    # 3줄 분량 스니펫은 검색 시점에 잘라 둔 것 (search.compact_result)
+    unit    = row.get("unit")
+    snippet = row["snippet"]
 
     active    = st.session_state.get("side_panel")
     is_active = active is not None and active.get("id") == row.get("id")
     prefix    = "▶ " if is_active else ""
 
+    cite_part = f"  ·  {unit['citation']}" if unit else ""
     label = (
         f"{prefix}{doc_name}  [{doc_category} · {src_label}]{date_part}\n"
-        f"**{article_number}{'  ' + title_str if title_str else ''}**\n"
+        f"**{article_number}{'  ' + title_str if title_str else ''}**{cite_part}\n"
         f"{snippet}"
     )
 
     st.markdown('<div class="card-btn">', unsafe_allow_html=True)
     if st.button(label, key=f"card_{row['id']}", use_container_width=True):
+        # 세션에는 경량 행만 보관 — 본문은 보조 패널이 id 로 조회
         st.session_state["side_panel"] = row
     st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _viewer_url(article: dict, unit_start: int | None = None) -> str:
+    url = f"/?page=viewer&doc={article['doc_id']}&art={article['id']}"
+    if unit_start is not None:
+        url += f"&unit={unit_start}"
+    return url
+
+
+def _render_article_jump(ref: dict):
+    """조문 인용 검색 결과: 문서별 해당 조문으로 바로 이동하는 링크 (조문 뷰어 새 탭)."""
+    st.markdown(
+        f'<span style="font-size:0.88rem;color:#555;">조문 바로가기 &mdash; '
+        f'<b>{html.escape(ref["label"])}</b> ({len(ref["articles"])}개 문서)</span>',
+        unsafe_allow_html=True,
+    )
+    for a in ref["articles"]:
+        title = f" ({a['article_title']})" if a["article_title"] else ""
+        unit_note = "  ·  항/호/목 위치 없음" if ref["has_unit"] and a["unit_start"] is None else ""
+        st.markdown(
+            f'<a href="{_viewer_url(a, a["unit_start"])}" target="_blank" '
+            f'style="display:block;padding:10px 14px;margin:6px 0;border:1px solid #e2e8f0;'
+            f'border-radius:8px;text-decoration:none;color:#0f172a;">'
+            f'{html.escape(a["doc_name"])} {category_badge(a["doc_category"])}<br>'
+            f'<b>{html.escape(a["article_number"] or "")}{html.escape(title)}</b>'
+            f'<span style="color:#94a3b8;font-size:0.75rem;">{html.escape(unit_note)}</span></a>',
+            unsafe_allow_html=True,
+        )
@@ -2,8 +2,8 @@ import os
 import streamlit as st
 import io
 
-from db import upsert_document, insert_articles, update_article_count
-from parser import parse_pdf
+from db import ingest_document
+from parser import analyze_pdf
 
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "static", "uploads")
 
@@ -43,7 +43,8 @@ def render():
         with st.spinner("PDF 파싱 중..."):
             try:
                 pdf_bytes = io.BytesIO(uploaded_file.read())
-                articles = parse_pdf(pdf_bytes)
+                analysis = analyze_pdf(pdf_bytes)
+                articles = analysis["articles"]
             except ValueError as e:
                 st.error(f"❌ {e}")
                 return
@@ -63,11 +64,10 @@ def render():
             with open(save_path, "wb") as f:
                 f.write(pdf_bytes.read())
 
-            doc_id = upsert_document(
-                doc_name.strip(), doc_category, uploaded_file.name
+            ingest_document(
+                doc_name.strip(), doc_category, uploaded_file.name, articles,
+                analysis["enacted_date"],
             )
-            insert_articles(doc_id, articles)
-            update_article_count(doc_id, len(articles))
 
         st.success(
             f'✅ **"{doc_name}"** 인식 완료 — 총 **{len(articles)}개** 조문이 저장되었습니다.'